@@ -0,0 +1,74 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from reviews.models import User, UserRoleMixin
+
+TOKEN_VERSION_CLAIM = 'token_version'
+
+
+def token_version_cache_key(user_id):
+    return f'token_version:{user_id}'
+
+
+def get_token_version(user_id):
+    key = token_version_cache_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        version = User.objects.filter(
+            pk=user_id, is_active=True
+        ).values_list('token_version', flat=True).first()
+        if version is None:
+            return None
+        cache.set(key, version, settings.TOKEN_VERSION_CACHE_TIMEOUT)
+    return version
+
+
+def invalidate_user_tokens(user_id):
+    User.objects.filter(pk=user_id).update(
+        token_version=F('token_version') + 1
+    )
+    cache.delete(token_version_cache_key(user_id))
+
+
+class RoleAccessToken(AccessToken):
+    """Токен доступа с ролью пользователя и версией его токенов."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token['role'] = user.role
+        token['is_staff'] = user.is_staff
+        token['is_superuser'] = user.is_superuser
+        token[TOKEN_VERSION_CLAIM] = user.token_version
+        return token
+
+
+class RoleTokenUser(UserRoleMixin, TokenUser):
+    pass
+
+
+class RoleJWTAuthentication(JWTAuthentication):
+    """Аутентификация по JWT без загрузки пользователя из базы.
+
+    Токены `RoleAccessToken` проверяются по закешированной версии токенов
+    пользователя, а права берутся из самого токена. Токены без версии
+    обрабатываются как обычно, с запросом пользователя из базы.
+    """
+
+    def get_user(self, validated_token):
+        if TOKEN_VERSION_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+        version = get_token_version(
+            validated_token[api_settings.USER_ID_CLAIM]
+        )
+        if version != validated_token[TOKEN_VERSION_CLAIM]:
+            raise AuthenticationFailed(
+                'Токен отозван, получите новый.', code='token_revoked'
+            )
+        return RoleTokenUser(validated_token)
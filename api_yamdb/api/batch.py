@@ -0,0 +1,78 @@
+import logging
+from urllib.parse import urlsplit
+
+from django.http import HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+from rest_framework import status
+from rest_framework.views import APIView
+
+SUBREQUEST_META_EXCLUDE = ('CONTENT_LENGTH', 'CONTENT_TYPE')
+
+logger = logging.getLogger(__name__)
+
+
+def error_response(status_code, detail):
+    return {'status': status_code, 'headers': {}, 'body': {'detail': detail}}
+
+
+def build_subrequest(request, method, url):
+    """Копия запроса с другим адресом и уже выполненной аутентификацией."""
+    path, query = urlsplit(url)[2:4]
+    subrequest = HttpRequest()
+    subrequest.META = {
+        key: value for key, value in request.META.items()
+        if key not in SUBREQUEST_META_EXCLUDE
+    }
+    subrequest.META.update(
+        REQUEST_METHOD=method, PATH_INFO=path, QUERY_STRING=query
+    )
+    subrequest.method = method
+    subrequest.path = subrequest.path_info = path
+    subrequest.GET = QueryDict(query)
+    if request.user.is_authenticated:
+        # DRF подставит эти значения вместо повторного разбора JWT.
+        # Анонимный запрос аутентифицируется заново, чтобы подзапросы
+        # отвечали 401, а не 403.
+        subrequest._force_auth_user = request.user
+        subrequest._force_auth_token = request.auth
+    return subrequest
+
+
+def dispatch_subrequest(request, method, url, batch_view):
+    """Выполняет подзапрос через роутер и возвращает статус и данные.
+
+    Доступны только представления DRF: подзапрос не проходит через
+    middleware, а остальным представлениям оно нужно (например, админке).
+    Ошибка одного подзапроса становится его ответом 500 и не прерывает
+    остальные.
+    """
+    subrequest = build_subrequest(request, method, url)
+    try:
+        match = resolve(subrequest.path_info)
+    except Resolver404:
+        match = None
+    view_class = getattr(match.func, 'cls', None) if match else None
+    if (
+        view_class is None or not issubclass(view_class, APIView)
+        or issubclass(view_class, batch_view)
+    ):
+        return error_response(
+            status.HTTP_404_NOT_FOUND, 'Страница не найдена.'
+        )
+    subrequest.resolver_match = match
+    try:
+        response = match.func(subrequest, *match.args, **match.kwargs)
+    except Exception:
+        logger.exception('Ошибка подзапроса %s %s', method, url)
+        return error_response(
+            status.HTTP_500_INTERNAL_SERVER_ERROR,
+            'Внутренняя ошибка сервера.'
+        )
+    return {
+        'status': response.status_code,
+        'headers': {
+            header: value for header, value in response.items()
+            if header in ('ETag', 'X-Cache')
+        },
+        'body': getattr(response, 'data', None),
+    }
@@ -0,0 +1,59 @@
+import time
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+
+RESPONSE_CACHE_PREFIX = 'response_cache'
+
+
+def model_label(model):
+    return model._meta.label_lower
+
+
+def version_key(model):
+    return f'{RESPONSE_CACHE_PREFIX}:version:{model_label(model)}'
+
+
+def get_version(model):
+    key = version_key(model)
+    cache.add(key, time.time_ns(), timeout=None)
+    return cache.get(key)
+
+
+def bump_version(model):
+    try:
+        return cache.incr(version_key(model))
+    except ValueError:
+        # Счётчик вытеснен из кеша: новое значение не должно совпасть ни
+        # с одной из версий, под которыми могли остаться старые ответы.
+        version = time.time_ns()
+        cache.set(version_key(model), version, timeout=None)
+        return version
+
+
+def response_key(request, model):
+    query = urlencode(sorted(request.query_params.lists()), doseq=True)
+    return (
+        f'{RESPONSE_CACHE_PREFIX}:{model_label(model)}:{get_version(model)}:'
+        f'{request.get_host()}{request.path}?{query}'
+    )
+
+
+def counter_key(model, outcome):
+    return f'{RESPONSE_CACHE_PREFIX}:{outcome}:{model_label(model)}'
+
+
+def record_outcome(model, outcome):
+    key = counter_key(model, outcome)
+    cache.add(key, 0, timeout=None)
+    cache.incr(key)
+
+
+def get_stats(models):
+    return {
+        model_label(model): {
+            outcome: cache.get(counter_key(model, outcome), 0)
+            for outcome in ('hits', 'misses')
+        }
+        for model in models
+    }
@@ -0,0 +1,124 @@
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.db.models import Count
+from django.db.models.expressions import RawSQL
+
+from .cache import RESPONSE_CACHE_PREFIX, get_version
+from reviews.models import Category, Genre, Title
+from reviews.search import normalize_name
+
+# Параметры, которые не меняют набор произведений.
+FACET_IGNORED_PARAMS = (
+    'page', 'page_size', 'count', 'cursor', 'ordering', 'facets', 'fields',
+    'omit', 'expand',
+)
+
+# Фильтры-списки: порядок и повторы значений не меняют результат.
+LIST_PARAMS = ('ids', 'genre__in', 'genre_all')
+
+# Фильтры, которые сами сравнивают значения в форме normalize_name().
+NORMALIZED_PARAMS = ('name', 'name_startswith', 'fuzzy')
+
+
+def title_ids_subquery(titles):
+    """id отфильтрованных произведений как готовый SQL-подзапрос.
+
+    Поиск `?search=` добавляет условие через `.extra()`, которое ссылается
+    на таблицу `reviews_title` по имени. При вложении queryset Django
+    переименовывает таблицу, а сырой SQL — нет, поэтому подзапрос
+    компилируется отдельно, как самостоятельный запрос.
+    """
+    sql, params = titles.values('id').query.sql_with_params()
+    return RawSQL(sql, params)
+
+
+def genre_facet(title_ids):
+    return [
+        {'slug': slug, 'name': name, 'count': count}
+        for slug, name, count in Title.genre.through.objects.filter(
+            title_id__in=title_ids
+        ).values_list('genre__slug', 'genre__name').annotate(
+            count=Count('title_id')
+        ).order_by('-count', 'genre__slug')
+    ]
+
+
+def category_facet(title_ids):
+    return [
+        {'slug': slug, 'name': name, 'count': count}
+        for slug, name, count in Title.objects.filter(
+            pk__in=title_ids, category__isnull=False
+        ).values_list('category__slug', 'category__name').annotate(
+            count=Count('id')
+        ).order_by('-count', 'category__slug')
+    ]
+
+
+def year_facet(title_ids):
+    return [
+        {'value': year, 'count': count}
+        for year, count in Title.objects.filter(
+            pk__in=title_ids
+        ).values_list('year').annotate(count=Count('id')).order_by('-year')
+    ]
+
+
+FACETS = {
+    'genre': genre_facet,
+    'category': category_facet,
+    'year': year_facet,
+}
+
+
+def parse_facets(value):
+    names = [name.strip() for name in value.split(',')]
+    return [name for name in FACETS if name in names]
+
+
+def normalize_filter_value(param, value):
+    """Одинаковые по смыслу значения фильтра дают одинаковый ключ.
+
+    Остальные значения, в том числе текст `?search=`, где важны порядок
+    слов и запятые, попадают в ключ как есть.
+    """
+    if param in LIST_PARAMS:
+        return ','.join(sorted(set(value.split(','))))
+    if param in NORMALIZED_PARAMS:
+        return normalize_name(value)
+    return value
+
+
+def facets_key(request, names):
+    params = sorted(
+        (param, normalize_filter_value(param, value))
+        for param, values in request.query_params.lists()
+        if param not in FACET_IGNORED_PARAMS
+        for value in values
+    )
+    versions = ':'.join(
+        str(get_version(model)) for model in (Title, Genre, Category)
+    )
+    return (
+        f'{RESPONSE_CACHE_PREFIX}:facets:{versions}:{",".join(names)}:'
+        f'{urlencode(params)}'
+    )
+
+
+def get_facets(request, titles, names):
+    """Считает корзины одним GROUP BY на фасет и кеширует их."""
+    key = facets_key(request, names)
+    facets = cache.get(key)
+    if facets is None:
+        try:
+            title_ids = title_ids_subquery(
+                titles.prefetch_related(None).order_by()
+            )
+        except EmptyResultSet:
+            facets = {name: [] for name in names}
+        else:
+            facets = {name: FACETS[name](title_ids) for name in names}
+        cache.set(key, facets, settings.RESPONSE_CACHE_TIMEOUT)
+    return facets
@@ -1,9 +1,35 @@
+from django import forms
+from django.conf import settings
+from django.db.models import Case, When
 from django_filters import rest_framework as filters
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import (BaseFilterBackend, OrderingFilter,
+                                    SearchFilter)
 
+from reviews.fuzzy import fuzzy_match_titles
 from reviews.models import Title
+from reviews.search import normalize_name, search_titles
+
+# Верхняя граница диапазона для поиска по префиксу: любая строка,
+# начинающаяся с префикса, меньше префикса с этим символом на конце.
+PREFIX_UPPER_BOUND = '\U0010ffff'
+
+# Каждый жанр в `genre_all` добавляет JOIN, поэтому список ограничен.
+GENRE_ALL_MAX_LENGTH = 10
+
+
+class IntegerInFilter(filters.BaseInFilter, filters.NumberFilter):
+    field_class = forms.IntegerField
+
+
+class CharInFilter(filters.BaseInFilter, filters.CharFilter):
+    pass
 
 
 class TitleFilter(filters.FilterSet):
+    ids = IntegerInFilter(method='filter_ids')
+    genre__in = CharInFilter(method='filter_genre_any')
+    genre_all = CharInFilter(method='filter_genre_all')
     genre = filters.CharFilter(
         field_name='genre__slug',
         lookup_expr='icontains'
@@ -12,11 +38,120 @@ class TitleFilter(filters.FilterSet):
         field_name='category__slug',
         lookup_expr='icontains'
     )
-    name = filters.CharFilter(
-        field_name='name',
-        lookup_expr='icontains'
-    )
+    name = filters.CharFilter(method='filter_name')
+    name_startswith = filters.CharFilter(method='filter_name_startswith')
+    fuzzy = filters.CharFilter(method='filter_fuzzy')
 
     class Meta:
         model = Title
         fields = ('name', 'year', 'category', 'genre')
+
+    def filter_name(self, queryset, name, value):
+        return queryset.filter(name_normalized__contains=normalize_name(value))
+
+    def filter_name_startswith(self, queryset, name, value):
+        """Префикс как диапазон значений, чтобы работал индекс."""
+        prefix = normalize_name(value)
+        return queryset.filter(
+            name_normalized__gte=prefix,
+            name_normalized__lt=prefix + PREFIX_UPPER_BOUND
+        )
+
+    def filter_fuzzy(self, queryset, name, value):
+        """Похожие названия с опечатками и в другой раскладке."""
+        return self.filter_by_position(queryset, fuzzy_match_titles(
+            value, settings.FUZZY_SEARCH_THRESHOLD,
+            settings.FUZZY_SEARCH_MAX_RESULTS
+        ))
+
+    def filter_genre_any(self, queryset, name, value):
+        """Хотя бы один из жанров; подзапрос вместо JOIN без дублей."""
+        return queryset.filter(pk__in=Title.genre.through.objects.filter(
+            genre__slug__in=value
+        ).values('title_id'))
+
+    def filter_genre_all(self, queryset, name, value):
+        """Все перечисленные жанры сразу: по JOIN на каждый жанр.
+
+        Пары (title, genre) уникальны, поэтому дублей нет, а каждый JOIN
+        по индексу сужает выборку. GROUP BY ... HAVING COUNT медленнее
+        уже с трёх популярных жанров (benchmarks/bench_genre_filter.py).
+        """
+        slugs = list(dict.fromkeys(value))
+        if len(slugs) > GENRE_ALL_MAX_LENGTH:
+            raise ValidationError({name: [
+                f'Не больше {GENRE_ALL_MAX_LENGTH} жанров в запросе.'
+            ]})
+        for slug in slugs:
+            queryset = queryset.filter(genre__slug=slug)
+        return queryset
+
+    def filter_ids(self, queryset, name, value):
+        """Отдаёт произведения в порядке, в котором перечислены id."""
+        ids = list(dict.fromkeys(value))
+        if len(ids) > settings.TITLE_IDS_MAX_LENGTH:
+            raise ValidationError({name: [
+                f'Не больше {settings.TITLE_IDS_MAX_LENGTH} id в запросе.'
+            ]})
+        return self.filter_by_position(queryset, ids)
+
+    @staticmethod
+    def filter_by_position(queryset, ids):
+        if not ids:
+            return queryset.none()
+        return queryset.filter(pk__in=ids).order_by(Case(*(
+            When(pk=pk, then=position) for position, pk in enumerate(ids)
+        )))
+
+
+class NormalizedSearchFilter(SearchFilter):
+    """SearchFilter по колонкам `*_normalized`.
+
+    Поисковые слова нормализуются так же, как колонки, поэтому поиск
+    не зависит от регистра кириллицы и буквы ё.
+    """
+
+    def get_search_terms(self, request):
+        return [
+            normalize_name(term) for term in super().get_search_terms(request)
+        ]
+
+
+class IndexedOrderingFilter(OrderingFilter):
+    """Сортировка по одному полю, за которым стоит индекс.
+
+    `ordering_fields` вьюсета сопоставляет имени из `?ordering=` колонку
+    с индексом. К ней добавляется id в том же направлении, поэтому порядок
+    однозначен и читается из индекса без сортировки. Сортировка по
+    нескольким полям индексом не обслуживается и отклоняется.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        terms = [
+            term.strip() for term in request.query_params.get(
+                self.ordering_param, ''
+            ).split(',') if term.strip()
+        ]
+        if not terms:
+            return None
+        name = terms[0].lstrip('-')
+        if len(terms) > 1 or name not in view.ordering_fields:
+            raise ValidationError({self.ordering_param: [
+                'Укажите одно поле из: {}.'.format(
+                    ', '.join(view.ordering_fields)
+                )
+            ]})
+        direction = '-' if terms[0].startswith('-') else ''
+        return [
+            f'{direction}{view.ordering_fields[name]}', f'{direction}id'
+        ]
+
+
+class TitleSearchFilter(BaseFilterBackend):
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        value = request.query_params.get(self.search_param, '').strip()
+        if not value:
+            return queryset
+        return search_titles(queryset, value)
@@ -1,16 +1,162 @@
-from rest_framework import mixins, viewsets, filters
-from rest_framework import filters
-from rest_framework.pagination import PageNumberPagination
+import hashlib
+from itertools import chain
 
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import mixins, status, viewsets
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from .cache import record_outcome, response_key
+from .filters import NormalizedSearchFilter
+from .pagination import CountPageNumberPagination
 from .permissions import IsAdminUserOrReadOnly
 
 
-class CategoryGenreViewSet(mixins.CreateModelMixin,
+class CachedListMixin:
+    """Отдаёт список из кеша, пока версия модели не изменилась."""
+
+    def list(self, request, *args, **kwargs):
+        model = self.queryset.model
+        key = response_key(request, model)
+        data = cache.get(key)
+        if data is not None:
+            record_outcome(model, 'hits')
+            return Response(data, headers={'X-Cache': 'HIT'})
+        response = super().list(request, *args, **kwargs)
+        cache.set(key, response.data, settings.RESPONSE_CACHE_TIMEOUT)
+        record_outcome(model, 'misses')
+        response['X-Cache'] = 'MISS'
+        return response
+
+
+class ConditionalGetMixin:
+    """Отвечает 304 на If-None-Match, не выполняя основной запрос.
+
+    Вьюсет задаёт `get_version_parts()` — дешёвый набор значений, который
+    меняется при любом изменении отдаваемых данных, или None, если для
+    действия ETag не вычисляется.
+    """
+
+    def get_version_parts(self):
+        return None
+
+    def get_etag(self, request):
+        parts = self.get_version_parts()
+        if parts is None:
+            return None
+        source = '|'.join(map(str, (
+            *parts,
+            request.accepted_renderer.format,
+            request.get_host(),
+            request.get_full_path(),
+        )))
+        return quote_etag(hashlib.md5(source.encode()).hexdigest())
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        etag = self.get_etag(request)
+        if etag is not None and etag in parse_etags(
+            request.META.get('HTTP_IF_NONE_MATCH', '')
+        ):
+            return Response(
+                status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag}
+            )
+        response = handler(request, *args, **kwargs)
+        if etag is not None and response.status_code == status.HTTP_200_OK:
+            response['ETag'] = etag
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class SparseFieldsMixin:
+    """Ограничивает поля ответа параметрами `?fields=` и `?omit=`.
+
+    `sparse_fields` сопоставляет полю ответа колонки модели для `.only()`;
+    связи из этих колонок подгружаются через select_related, а поля из
+    `sparse_prefetch` — через prefetch_related, только если они запрошены.
+    Неизвестные имена полей и пустой итоговый набор дают ответ 400.
+    """
+
+    sparse_fields = {}
+    sparse_prefetch = {}
+    sparse_required_columns = ('id',)
+
+    @staticmethod
+    def split_param(value):
+        return {name.strip() for name in value.split(',') if name.strip()}
+
+    def get_sparse_fields(self):
+        if not hasattr(self, '_sparse_fields'):
+            self._sparse_fields = None
+            params = self.request.query_params
+            fields = self.split_param(params.get('fields', ''))
+            omit = self.split_param(params.get('omit', ''))
+            if self.request.method == 'GET' and (fields or omit):
+                for param, names in (('fields', fields), ('omit', omit)):
+                    unknown = names.difference(self.sparse_fields)
+                    if unknown:
+                        raise ValidationError({param: [
+                            'Неизвестные поля: {}. Доступны: {}.'.format(
+                                ', '.join(sorted(unknown)),
+                                ', '.join(self.sparse_fields)
+                            )
+                        ]})
+                selected = [
+                    name for name in self.sparse_fields
+                    if (not fields or name in fields) and name not in omit
+                ]
+                if not selected:
+                    raise ValidationError({'omit': [
+                        'Нельзя исключить все поля ответа.'
+                    ]})
+                self._sparse_fields = selected
+        return self._sparse_fields
+
+    def get_sparse_columns(self, fields):
+        return list(dict.fromkeys(chain(
+            self.sparse_required_columns,
+            *(self.sparse_fields[name] for name in fields)
+        )))
+
+    def apply_sparse_fields(self, queryset):
+        fields = self.get_sparse_fields()
+        selected = list(self.sparse_fields) if fields is None else fields
+        columns = self.get_sparse_columns(selected)
+        relations = {
+            column.split('__')[0] for column in columns if '__' in column
+        }
+        if relations:
+            queryset = queryset.select_related(*relations)
+        for name, lookup in self.sparse_prefetch.items():
+            if name in selected:
+                queryset = queryset.prefetch_related(lookup)
+        if fields is not None:
+            queryset = queryset.only(*columns)
+        return queryset
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['sparse_fields'] = self.get_sparse_fields()
+        return context
+
+
+class CategoryGenreViewSet(CachedListMixin,
+                           mixins.CreateModelMixin,
                            mixins.ListModelMixin,
                            mixins.DestroyModelMixin,
                            viewsets.GenericViewSet):
     permission_classes = (IsAdminUserOrReadOnly,)
     lookup_field = 'slug'
-    filter_backends = (filters.SearchFilter,)
-    search_fields = ('name',)
-    pagination_class = PageNumberPagination
+    filter_backends = (NormalizedSearchFilter,)
+    search_fields = ('name_normalized',)
+    pagination_class = CountPageNumberPagination
@@ -0,0 +1,121 @@
+import hashlib
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import EmptyPage, PageNotAnInteger
+from django.core.paginator import Paginator as DjangoPaginator
+from django.utils.functional import cached_property
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+
+
+class EstimatedCountPaginator(DjangoPaginator):
+    """Берёт COUNT(*) из кеша; значение может отставать на время жизни."""
+
+    @cached_property
+    def count(self):
+        try:
+            sql, params = self.object_list.query.sql_with_params()
+        except EmptyResultSet:
+            return 0
+        key = 'pagination_count:' + hashlib.md5(
+            f'{sql}|{params}'.encode()
+        ).hexdigest()
+        count = cache.get(key)
+        if count is None:
+            count = super().count
+            cache.set(key, count, settings.PAGINATION_COUNT_CACHE_TIMEOUT)
+        return count
+
+
+class UncountedPaginator(DjangoPaginator):
+    """Не считает COUNT(*): о следующей странице судит по лишней строке."""
+
+    def validate_number(self, number):
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger('That page number is not an integer')
+        if number < 1:
+            raise EmptyPage('That page number is less than 1')
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage('That page contains no results')
+        self.num_pages = number + (len(rows) > self.per_page)
+        return self._get_page(rows[:self.per_page], number, self)
+
+
+class CountPageNumberPagination(PageNumberPagination):
+    """Постраничная пагинация с управлением подсчётом через `?count=`.
+
+    `count=estimate` отдаёт закешированное количество объектов,
+    `count=false` не считает его вовсе и убирает ключ `count` из ответа.
+    По умолчанию количество считается точно.
+    """
+
+    count_query_param = 'count'
+    django_paginator_classes = {
+        'estimate': EstimatedCountPaginator,
+        'false': UncountedPaginator,
+    }
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.django_paginator_class = self.django_paginator_classes.get(
+            request.query_params.get(self.count_query_param), DjangoPaginator
+        )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.django_paginator_class is not UncountedPaginator:
+            return super().get_paginated_response(data)
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data)
+        ]))
+
+
+class TitlePagination(CountPageNumberPagination):
+    """Пагинация произведений: `?ids=` целиком помещается на одну страницу."""
+
+    ids_query_param = 'ids'
+
+    def get_page_size(self, request):
+        if request.query_params.get(self.ids_query_param):
+            return settings.TITLE_IDS_MAX_LENGTH
+        return super().get_page_size(request)
+
+
+class PubDateCursorPagination(CursorPagination):
+    ordering = ('pub_date', 'id')
+
+
+class PageNumberOrCursorPagination(CountPageNumberPagination):
+    """Постраничная пагинация с переходом на курсорную по `?cursor=`.
+
+    Курсорный режим не считает COUNT(*) и не использует OFFSET, поэтому
+    глубокие страницы отдаются так же быстро, как первая.
+    """
+
+    cursor_query_param = PubDateCursorPagination.cursor_query_param
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_pagination = None
+        if self.cursor_query_param in request.query_params:
+            self.cursor_pagination = PubDateCursorPagination()
+            return self.cursor_pagination.paginate_queryset(
+                queryset, request, view
+            )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_pagination is not None:
+            return self.cursor_pagination.get_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -20,7 +20,7 @@ class IsAuthorOrReadOnly(BasePermission):
         return (
             request.method in SAFE_METHODS
             or (request.user.is_authenticated and (
-                obj.author == request.user
+                obj.author_id == request.user.id
                 or request.user.is_admin
                 or request.user.is_moderator
             ))
@@ -0,0 +1,75 @@
+import decimal
+
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# В этом диапазоне orjson и json записывают float одинаково: вне его json
+# переходит на экспоненту вида 1e+16, а NaN и бесконечность orjson
+# превращает в null вместо ValueError (или NaN при STRICT_JSON=False).
+SAME_FLOAT_RANGE = (1e-4, 1e16)
+
+
+def has_unsafe_floats(data):
+    """Есть ли в данных float, который orjson запишет не так, как json.
+
+    Decimal проверяется тоже: JSONEncoder DRF отдаёт его как float.
+    """
+    low, high = SAME_FLOAT_RANGE
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        value_type = type(value)
+        if value_type is str or value_type is int or value is None:
+            continue
+        if isinstance(value, (float, decimal.Decimal)):
+            value = float(value)
+            if value and not low <= abs(value) < high:
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return False
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer на orjson с тем же байтовым результатом.
+
+    Без orjson, для форматированного вывода, нестандартных настроек JSON,
+    а также для данных с NaN, бесконечностью и float, которые json
+    записывает в экспоненциальной форме, используется стандартная
+    реализация DRF.
+    """
+
+    if orjson is not None:
+        options = (
+            orjson.OPT_NON_STR_KEYS
+            | orjson.OPT_PASSTHROUGH_DATETIME
+            | orjson.OPT_PASSTHROUGH_DATACLASS
+        )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or data is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {})
+            is not None
+            or has_unsafe_floats(data)
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(
+                data, default=self.encoder_class().default, option=self.options
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Как и JSONRenderer, экранируем U+2028 и U+2029.
+        return ret.replace(
+            b'\xe2\x80\xa8', b'\\u2028'
+        ).replace(b'\xe2\x80\xa9', b'\\u2029')
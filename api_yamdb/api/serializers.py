@@ -1,15 +1,36 @@
+from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
 from django.core.mail import send_mail
+from django.db.models import Prefetch, prefetch_related_objects
 from django.shortcuts import get_object_or_404
 from django.utils.http import urlsafe_base64_encode
 from rest_framework import serializers
 
 from reviews.constants import EMAIL_MAX_LENGTH, USERNAME_MAX_LENGTH
-from reviews.models import Category, Comment, Genre, Review, Title, User
+from reviews.models import (Category, Comment, EmailOutbox, Genre, Review,
+                            Title, User)
 from reviews.validators import validate_username
 
+# Жанры произведения во всех ответах идут по id жанра, как и в списке,
+# который собирается из промежуточной таблицы без сериализаторов.
+TITLE_GENRES_PREFETCH = Prefetch(
+    'genre', queryset=Genre.objects.order_by('id')
+)
 
-class UsersSerializer(serializers.ModelSerializer):
+
+class SparseFieldsSerializerMixin:
+    """Оставляет только поля, выбранные вьюсетом через `?fields=`."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields = self.context.get('sparse_fields')
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class UsersSerializer(SparseFieldsSerializerMixin,
+                      serializers.ModelSerializer):
     class Meta:
         model = User
         fields = (
@@ -36,6 +57,18 @@ class NotAdminSerializer(serializers.ModelSerializer):
         read_only_fields = ('role',)
 
 
+class BatchRequestSerializer(serializers.Serializer):
+    method = serializers.ChoiceField(choices=('GET',), default='GET')
+    url = serializers.CharField()
+
+    def validate_url(self, value):
+        if not value.startswith('/'):
+            raise serializers.ValidationError(
+                'Укажите путь от корня сайта, например /api/v1/genres/.'
+            )
+        return value
+
+
 class GetTokenSerializer(serializers.Serializer):
     username = serializers.CharField(required=True)
     confirmation_code = serializers.CharField(required=True)
@@ -101,13 +134,26 @@ class SignUpSerializer(serializers.Serializer):
             f'http://example.com/confirm/{uid}/{token}'
         )
 
-        send_mail(
-            subject='Подтверждение email для доступа к API!',
-            message=email_body,
-            from_email=None,
-            recipient_list=[validated_data['email']],
-            fail_silently=False
-        )
+        subject = 'Подтверждение email для доступа к API!'
+
+        if settings.EMAIL_OUTBOX_ENABLED:
+            EmailOutbox.objects.update_or_create(
+                recipient=validated_data['email'],
+                defaults={
+                    'subject': subject,
+                    'message': email_body,
+                    'attempts': 0,
+                    'last_error': '',
+                }
+            )
+        else:
+            send_mail(
+                subject=subject,
+                message=email_body,
+                from_email=None,
+                recipient_list=[validated_data['email']],
+                fail_silently=False
+            )
 
         return user
 
@@ -124,14 +170,17 @@ class GenreSerializer(serializers.ModelSerializer):
         fields = ('name', 'slug')
 
 
-class TitleGetSerializer(serializers.ModelSerializer):
+class TitleGetSerializer(SparseFieldsSerializerMixin,
+                         serializers.ModelSerializer):
     category = CategorySerializer(read_only=True)
     genre = GenreSerializer(many=True, read_only=True)
     rating = serializers.IntegerField(default=None)
 
     class Meta:
         model = Title
-        fields = '__all__'
+        fields = (
+            'id', 'name', 'year', 'rating', 'description', 'genre', 'category'
+        )
 
 
 class TitleCreateUpdateSerializer(serializers.ModelSerializer):
@@ -149,13 +198,15 @@ class TitleCreateUpdateSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Title
-        fields = '__all__'
+        fields = ('id', 'name', 'year', 'description', 'genre', 'category')
 
     def to_representation(self, instance):
+        prefetch_related_objects([instance], TITLE_GENRES_PREFETCH)
         return TitleGetSerializer(instance, context=self.context).data
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(SparseFieldsSerializerMixin,
+                       serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
         slug_field='username',
         read_only=True,
@@ -169,7 +220,7 @@ class ReviewSerializer(serializers.ModelSerializer):
         request = self.context['request']
         title_id = self.context['view'].kwargs.get('title_id')
         if request.method == 'POST' and Review.objects.filter(
-                title_id=title_id, author=request.user
+                title_id=title_id, author_id=request.user.id
         ).exists():
             raise serializers.ValidationError(
                 'You have already reviewed this title.'
@@ -177,7 +228,8 @@ class ReviewSerializer(serializers.ModelSerializer):
         return data
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(SparseFieldsSerializerMixin,
+                        serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
         slug_field='username',
         read_only=True,
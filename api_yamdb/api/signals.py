@@ -0,0 +1,33 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import bump_version
+from .suggest import title_prefix_index
+from reviews.models import Category, Genre, Title
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Genre)
+def bump_response_cache_version(sender, **kwargs):
+    bump_version(sender)
+
+
+@receiver(post_save, sender=Title)
+def bump_title_cache_version_on_save(sender, instance, created, **kwargs):
+    title_prefix_index.apply(
+        bump_version(Title), instance.pk, instance.name_normalized,
+        instance.name, created=created
+    )
+
+
+@receiver(post_delete, sender=Title)
+def bump_title_cache_version_on_delete(sender, instance, **kwargs):
+    title_prefix_index.apply(bump_version(Title), instance.pk)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def bump_title_cache_version_on_genre_change(sender, action, **kwargs):
+    if action.startswith('post_'):
+        title_prefix_index.apply(bump_version(Title))
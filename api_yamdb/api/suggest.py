@@ -0,0 +1,136 @@
+import bisect
+import threading
+import time
+
+from django.conf import settings
+
+from .cache import get_version
+from reviews.models import Title
+from reviews.search import normalize_name
+
+
+class TitlePrefixIndex:
+    """Отсортированный массив нормализованных названий в памяти процесса.
+
+    Подсказки ищутся бинарным поиском по префиксу, поэтому не зависят от
+    размера каталога. Индекс строится при первом запросе, а изменения
+    произведений в этом процессе применяются на месте.
+
+    Изменения из других процессов индекс замечает не чаще раза в
+    TITLE_SUGGEST_CHECK_INTERVAL секунд: по версии Title из кеша ответов
+    (общей для процессов, только если настроен общий кеш, `CACHE_BACKEND`)
+    и по наибольшему id произведения в базе — так видны и вставки в обход
+    сигналов, например из `load_data`. Удаления в других процессах без
+    общего кеша и переименования через `QuerySet.update()` не видны.
+
+    Новый индекс собирается без `self.lock` и подменяет прежний целиком,
+    а до тех пор подсказки отдаются из прежнего.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.build_lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.entries = None
+            self.keys = {}
+            self.names = {}
+            self.version = None
+            self.fingerprint = None
+            self.checked_at = None
+
+    @staticmethod
+    def get_fingerprint():
+        """Наибольший id: один шаг по первичному ключу, без обхода таблицы."""
+        return Title.objects.order_by('-id').values_list(
+            'id', flat=True
+        ).first() or 0
+
+    def build(self):
+        waiting = self.entries is None
+        if not self.build_lock.acquire(blocking=waiting):
+            # Индекс уже перестраивает другой поток.
+            return
+        try:
+            if waiting and self.entries is not None:
+                return
+            version = get_version(Title)
+            fingerprint = self.get_fingerprint()
+            keys = {}
+            names = {}
+            rows = Title.objects.values_list('id', 'name_normalized', 'name')
+            for title_id, key, name in rows.iterator():
+                keys[title_id] = key
+                names[title_id] = name
+            entries = sorted((key, title_id) for title_id, key in keys.items())
+            with self.lock:
+                self.entries = entries
+                self.keys = keys
+                self.names = names
+                self.version = version
+                self.fingerprint = fingerprint
+                self.checked_at = time.monotonic()
+        finally:
+            self.build_lock.release()
+
+    def is_stale(self, version):
+        if self.entries is None:
+            return True
+        now = time.monotonic()
+        if now - self.checked_at < settings.TITLE_SUGGEST_CHECK_INTERVAL:
+            return False
+        self.checked_at = now
+        return (
+            version != self.version
+            or self.get_fingerprint() > self.fingerprint
+        )
+
+    def remove(self, title_id):
+        key = self.keys.pop(title_id, None)
+        self.names.pop(title_id, None)
+        if key is not None:
+            position = bisect.bisect_left(self.entries, (key, title_id))
+            del self.entries[position]
+
+    def apply(self, version, title_id=None, key=None, name=None,
+              created=False):
+        """Применяет изменение из этого процесса к индексу на месте.
+
+        Если перед ним пропущены чужие изменения, версия индекса остаётся
+        прежней, и он перестроится при ближайшей проверке.
+        """
+        with self.lock:
+            if self.entries is None:
+                return
+            if title_id is not None:
+                self.remove(title_id)
+                if key is not None:
+                    bisect.insort(self.entries, (key, title_id))
+                    self.keys[title_id] = key
+                    self.names[title_id] = name
+            if created:
+                self.fingerprint = max(self.fingerprint, title_id)
+            if version == self.version + 1:
+                self.version = version
+
+    def suggest(self, query, limit):
+        prefix = normalize_name(query)
+        if not prefix:
+            return []
+        if self.is_stale(get_version(Title)):
+            self.build()
+        with self.lock:
+            position = bisect.bisect_left(self.entries, (prefix,))
+            suggestions = []
+            for key, title_id in self.entries[position:position + limit]:
+                if not key.startswith(prefix):
+                    break
+                suggestions.append(
+                    {'id': title_id, 'name': self.names[title_id]}
+                )
+            return suggestions
+
+
+title_prefix_index = TitlePrefixIndex()
@@ -1,8 +1,9 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .views import (APIGetToken, APISignup, CategoryViewSet, CommentViewSet,
-                    GenreViewSet, ReviewViewSet, TitleViewSet, UsersViewSet)
+from .views import (APIGetToken, APISignup, BatchView, CategoryViewSet,
+                    CommentViewSet, GenreViewSet, ResponseCacheStatsView,
+                    ReviewViewSet, TitleViewSet, UsersViewSet)
 
 router_v1 = DefaultRouter()
 router_v1.register('categories', CategoryViewSet, basename='categories')
@@ -24,4 +25,8 @@ auth_urls = ([
 urlpatterns = [
     path('v1/', include(router_v1.urls)),
     path('v1/auth/', include(auth_urls)),
+    path(
+        'v1/cache-stats/', ResponseCacheStatsView.as_view(), name='cache_stats'
+    ),
+    path('v1/batch/', BatchView.as_view(), name='batch'),
 ]
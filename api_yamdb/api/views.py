@@ -1,34 +1,76 @@
-from django.db.models import Avg
+from django.conf import settings
+from django.db.models import Count, Sum
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import filters, permissions, status, viewsets
+from rest_framework import permissions, status, viewsets
 from rest_framework.decorators import action
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import (AllowAny, IsAuthenticated,
                                         IsAuthenticatedOrReadOnly)
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import AccessToken
 
-from .filters import TitleFilter
-from .mixins import CategoryGenreViewSet
+from .authentication import RoleAccessToken, invalidate_user_tokens
+from .batch import dispatch_subrequest
+from .cache import get_stats, get_version
+from .facets import get_facets, parse_facets
+from .filters import (IndexedOrderingFilter, NormalizedSearchFilter,
+                      TitleFilter, TitleSearchFilter)
+from .mixins import (CategoryGenreViewSet, ConditionalGetMixin,
+                     SparseFieldsMixin)
+from .pagination import PageNumberOrCursorPagination, TitlePagination
 from .permissions import AdminOnly, IsAdminUserOrReadOnly, IsAuthorOrReadOnly
-from .serializers import (CategorySerializer, CommentSerializer,
+from .serializers import (TITLE_GENRES_PREFETCH, BatchRequestSerializer,
+                          CategorySerializer, CommentSerializer,
                           GenreSerializer, GetTokenSerializer,
                           NotAdminSerializer, ReviewSerializer,
                           SignUpSerializer, TitleCreateUpdateSerializer,
                           TitleGetSerializer, UsersSerializer)
+from .suggest import title_prefix_index
+from reviews.constants import MAX_SCORE, MIN_SCORE
 from reviews.models import Category, Genre, Review, Title, User
 
+TITLE_LIST_REPRESENTATION = {
+    'id': lambda row, genres: row['id'],
+    'name': lambda row, genres: row['name'],
+    'year': lambda row, genres: row['year'],
+    'rating': lambda row, genres: (
+        int(row['rating_sum'] / row['rating_count'])
+        if row['rating_count'] else None
+    ),
+    'description': lambda row, genres: row['description'],
+    'genre': lambda row, genres: genres.get(row['id'], []),
+    'category': lambda row, genres: (
+        {'name': row['category__name'], 'slug': row['category__slug']}
+        if row['category__slug'] is not None else None
+    ),
+}
 
-class UsersViewSet(viewsets.ModelViewSet):
+TITLE_EXPANSIONS = ('reviews', 'comments_count', 'score_histogram')
+
+AUTHORED_SPARSE_FIELDS = {
+    'id': ('id',),
+    'text': ('text',),
+    'author': ('author__username',),
+    'pub_date': ('pub_date',),
+}
+
+
+class UsersViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = User.objects.all().order_by('id')
     serializer_class = UsersSerializer
     permission_classes = (AdminOnly,)
     lookup_field = 'username'
-    filter_backends = [filters.SearchFilter]
-    search_fields = ['username', 'email']
+    filter_backends = [NormalizedSearchFilter]
+    search_fields = ['username_normalized', 'email']
     http_method_names = ['get', 'post', 'patch', 'delete']
+    sparse_fields = {
+        name: (name,) for name in UsersSerializer.Meta.fields
+    }
+
+    def get_queryset(self):
+        return self.apply_sparse_fields(super().get_queryset())
 
     @action(
         methods=['GET', 'PATCH'],
@@ -36,15 +78,31 @@ class UsersViewSet(viewsets.ModelViewSet):
         permission_classes=(IsAuthenticated,),
         url_path='me')
     def get_current_user_info(self, request):
+        user = request.user
+        if not isinstance(user, User):
+            user = get_object_or_404(User, pk=user.pk)
         if request.method == 'PATCH':
             serializer = NotAdminSerializer(
-                request.user,
+                user,
                 data=request.data,
                 partial=True)
             serializer.is_valid(raise_exception=True)
             serializer.save()
             return Response(serializer.data, status=status.HTTP_200_OK)
-        return Response(UsersSerializer(request.user).data)
+        return Response(
+            UsersSerializer(user, context=self.get_serializer_context()).data
+        )
+
+    def perform_update(self, serializer):
+        role = serializer.instance.role
+        user = serializer.save()
+        if user.role != role:
+            invalidate_user_tokens(user.pk)
+
+    def perform_destroy(self, instance):
+        user_id = instance.pk
+        instance.delete()
+        invalidate_user_tokens(user_id)
 
 
 class APIGetToken(APIView):
@@ -56,7 +114,7 @@ class APIGetToken(APIView):
 
         user = get_object_or_404(
             User, username=serializer.validated_data['username'])
-        token = AccessToken.for_user(user)
+        token = RoleAccessToken.for_user(user)
         return Response({'token': str(token)}, status=status.HTTP_200_OK)
 
 
@@ -74,6 +132,45 @@ class APISignup(APIView):
         )
 
 
+class ResponseCacheStatsView(APIView):
+    permission_classes = (AdminOnly,)
+
+    def get(self, request):
+        return Response(get_stats((Category, Genre)))
+
+
+class BatchView(APIView):
+    """Выполняет список GET-подзапросов за один HTTP-запрос.
+
+    Подзапросы проходят через обычные роутер и вьюсеты с уже
+    аутентифицированным пользователем; права проверяются для каждого.
+    """
+
+    permission_classes = (AllowAny,)
+
+    def post(self, request):
+        if not isinstance(request.data, list):
+            raise ValidationError({
+                'detail': 'Ожидается список подзапросов.'
+            })
+        if len(request.data) > settings.BATCH_MAX_REQUESTS:
+            raise ValidationError({
+                'detail': 'Не больше {} подзапросов в одном запросе.'.format(
+                    settings.BATCH_MAX_REQUESTS
+                )
+            })
+        serializer = BatchRequestSerializer(
+            data=request.data, many=True, allow_empty=False
+        )
+        serializer.is_valid(raise_exception=True)
+        return Response([
+            dispatch_subrequest(
+                request, subrequest['method'], subrequest['url'], type(self)
+            )
+            for subrequest in serializer.validated_data
+        ])
+
+
 class CategoryViewSet(CategoryGenreViewSet):
     queryset = Category.objects.all().order_by('id')
     serializer_class = CategorySerializer
@@ -84,55 +181,239 @@ class GenreViewSet(CategoryGenreViewSet):
     serializer_class = GenreSerializer
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(SparseFieldsMixin, ConditionalGetMixin,
+                   viewsets.ModelViewSet):
     http_method_names = ['get', 'post', 'patch', 'delete']
-    queryset = Title.objects.annotate(
-        rating=Avg('reviews__score')
-    ).order_by('id')
+    queryset = Title.objects.order_by('id')
     permission_classes = (IsAdminUserOrReadOnly,)
-    pagination_class = PageNumberPagination
-    filter_backends = [DjangoFilterBackend]
+    pagination_class = TitlePagination
+    filter_backends = [
+        DjangoFilterBackend, TitleSearchFilter, IndexedOrderingFilter
+    ]
     filterset_class = TitleFilter
+    ordering_fields = {
+        'rating': 'rating_avg',
+        'year': 'year',
+        'name': 'name_normalized',
+        'reviews_count': 'rating_count',
+    }
+    sparse_fields = {
+        'id': ('id',),
+        'name': ('name',),
+        'year': ('year',),
+        'rating': ('rating_sum', 'rating_count'),
+        'description': ('description',),
+        'genre': (),
+        'category': ('category__name', 'category__slug'),
+    }
+    sparse_prefetch = {'genre': TITLE_GENRES_PREFETCH}
+
+    def get_queryset(self):
+        return self.apply_sparse_fields(super().get_queryset())
 
     def get_serializer_class(self):
         if self.action in ('create', 'update', 'partial_update'):
             return TitleCreateUpdateSerializer
         return TitleGetSerializer
 
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        response = self.get_list_response(queryset)
+        facets = parse_facets(request.query_params.get('facets', ''))
+        if facets:
+            response.data['facets'] = get_facets(request, queryset, facets)
+        return response
+
+    @action(detail=False, url_path='top')
+    def top(self, request):
+        """Лидеры по сглаженному рейтингу; отзывы при этом не читаются."""
+        return self.get_list_response(
+            self.filter_queryset(self.get_queryset()).filter(
+                rating_count__gt=0
+            ).order_by('-ranking', 'id')
+        )
+
+    @action(detail=False, url_path='suggest')
+    def suggest(self, request):
+        """Подсказки по началу названия из индекса в памяти процесса."""
+        return Response(title_prefix_index.suggest(
+            request.query_params.get('q', ''), settings.TITLE_SUGGEST_LIMIT
+        ))
+
+    def get_list_response(self, queryset):
+        """Список без сериализаторов: словари собираются из .values()."""
+        fields = self.get_sparse_fields()
+        if fields is None:
+            fields = list(self.sparse_fields)
+        page = self.paginate_queryset(
+            queryset.prefetch_related(None).values(
+                *self.get_sparse_columns(fields)
+            )
+        )
+        genres = {}
+        if 'genre' in fields:
+            for title_id, name, slug in Title.genre.through.objects.filter(
+                title_id__in=[row['id'] for row in page]
+            ).order_by('title_id', 'genre_id').values_list(
+                'title_id', 'genre__name', 'genre__slug'
+            ):
+                genres.setdefault(title_id, []).append(
+                    {'name': name, 'slug': slug}
+                )
+        return self.get_paginated_response([
+            {name: TITLE_LIST_REPRESENTATION[name](row, genres)
+             for name in fields}
+            for row in page
+        ])
+
+    def get_expand(self):
+        """Разбирает `?expand=`; `comments_count` встраивает и отзывы."""
+        if not hasattr(self, '_expand'):
+            expand = {
+                name.strip() for name in self.request.query_params.get(
+                    'expand', ''
+                ).split(',')
+            }.intersection(TITLE_EXPANSIONS)
+            if 'comments_count' in expand:
+                expand.add('reviews')
+            self._expand = expand
+        return self._expand
+
+    def retrieve(self, request, *args, **kwargs):
+        response = super().retrieve(request, *args, **kwargs)
+        expand = self.get_expand()
+        if response.status_code != status.HTTP_200_OK or not expand:
+            return response
+        title_id = self.kwargs['pk']
+        if 'reviews' in expand:
+            response.data['reviews'] = self.get_reviews_page(
+                title_id, 'comments_count' in expand
+            )
+        if 'score_histogram' in expand:
+            response.data['score_histogram'] = self.get_score_histogram(
+                title_id
+            )
+        return response
+
+    def get_reviews_page(self, title_id, with_comments_count):
+        """Первая страница отзывов одним запросом, без COUNT(*)."""
+        page_size = self.paginator.get_page_size(self.request)
+        queryset = Review.objects.filter(
+            title_id=title_id
+        ).select_related('author').order_by('id')
+        if with_comments_count:
+            queryset = queryset.annotate(comments_count=Count('comments'))
+        reviews = list(queryset[:page_size + 1])
+        results = []
+        for review in reviews[:page_size]:
+            data = ReviewSerializer(
+                review, context={'request': self.request}
+            ).data
+            if with_comments_count:
+                data['comments_count'] = review.comments_count
+            results.append(data)
+        next_url = None
+        if len(reviews) > page_size:
+            next_url = self.request.build_absolute_uri(
+                reverse('reviews-list', kwargs={'title_id': title_id})
+            ) + '?page=2'
+        return {'next': next_url, 'results': results}
+
+    @staticmethod
+    def get_score_histogram(title_id):
+        histogram = {
+            str(score): 0 for score in range(MIN_SCORE, MAX_SCORE + 1)
+        }
+        for score, total in Review.objects.filter(
+            title_id=title_id
+        ).values_list('score').annotate(total=Count('id')).order_by():
+            histogram[str(score)] = total
+        return histogram
 
-class ReviewViewSet(viewsets.ModelViewSet):
+    def get_version_parts(self):
+        if self.action != 'retrieve':
+            return None
+        try:
+            pk = int(self.kwargs.get('pk'))
+        except (TypeError, ValueError):
+            # На некорректный pk get_object() ответит 404.
+            return None
+        columns = ['version']
+        queryset = Title.objects.filter(pk=pk)
+        if 'comments_count' in self.get_expand():
+            # Комментарии меняют версию отзыва, а не произведения.
+            queryset = queryset.annotate(
+                reviews_version=Sum('reviews__version')
+            )
+            columns.append('reviews_version')
+        versions = queryset.values_list(*columns).first()
+        if versions is None:
+            return None
+        return (
+            'title', pk, *versions,
+            get_version(Category), get_version(Genre)
+        )
+
+
+class ReviewViewSet(SparseFieldsMixin, ConditionalGetMixin,
+                    viewsets.ModelViewSet):
     serializer_class = ReviewSerializer
     permission_classes = (IsAuthenticatedOrReadOnly, IsAuthorOrReadOnly)
+    pagination_class = PageNumberOrCursorPagination
     http_method_names = ['get', 'post', 'patch', 'delete']
+    sparse_fields = {**AUTHORED_SPARSE_FIELDS, 'score': ('score',)}
+    # pub_date нужен курсорной пагинации, даже если его нет в ответе.
+    sparse_required_columns = ('id', 'pub_date')
 
     def get_title(self):
-        return get_object_or_404(Title, id=self.kwargs.get('title_id'))
+        if not hasattr(self, '_title'):
+            self._title = get_object_or_404(
+                Title, id=self.kwargs.get('title_id')
+            )
+        return self._title
+
+    def get_version_parts(self):
+        title = self.get_title()
+        return ('reviews', title.pk, title.version)
 
     def get_queryset(self):
-        return self.get_title().reviews.all().order_by('id')
+        return self.apply_sparse_fields(
+            self.get_title().reviews.order_by('id')
+        )
 
     def perform_create(self, serializer):
         title = self.get_title()
-        serializer.save(author=self.request.user, title=title)
+        serializer.save(author_id=self.request.user.id, title=title)
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(SparseFieldsMixin, ConditionalGetMixin,
+                     viewsets.ModelViewSet):
     http_method_names = ['get', 'post', 'patch', 'delete']
     serializer_class = CommentSerializer
     permission_classes = (IsAuthorOrReadOnly,
                           permissions.IsAuthenticatedOrReadOnly)
+    pagination_class = PageNumberOrCursorPagination
+    sparse_fields = AUTHORED_SPARSE_FIELDS
+    sparse_required_columns = ('id', 'pub_date')
 
     def get_review(self):
-        return get_object_or_404(
-            Review,
-            id=self.kwargs.get('review_id'),
-            title_id=self.kwargs.get('title_id')
-        )
+        if not hasattr(self, '_review'):
+            self._review = get_object_or_404(
+                Review,
+                id=self.kwargs.get('review_id'),
+                title_id=self.kwargs.get('title_id')
+            )
+        return self._review
 
-    def get_queryset(self):
+    def get_version_parts(self):
         review = self.get_review()
-        return review.comments.all().order_by('id')
+        return ('comments', review.pk, review.version)
+
+    def get_queryset(self):
+        return self.apply_sparse_fields(
+            self.get_review().comments.order_by('id')
+        )
 
     def perform_create(self, serializer):
         review = self.get_review()
-        serializer.save(author=self.request.user, review=review)
+        serializer.save(author_id=self.request.user.id, review=review)
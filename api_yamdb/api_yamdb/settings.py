@@ -1,3 +1,4 @@
+import os
 from datetime import timedelta
 from pathlib import Path
 
@@ -64,6 +65,20 @@ DATABASES = {
     }
 }
 
+# Кеш ответов, версий и счётчиков. LocMemCache у каждого процесса свой:
+# при нескольких процессах сервера укажите общий кеш, например
+# CACHE_BACKEND=django.core.cache.backends.memcached.PyMemcacheCache и
+# CACHE_LOCATION=127.0.0.1:11211, иначе сброс кеша в `load_data` и версии
+# из сигналов видны только тому процессу, где они произошли.
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
+    }
+}
+
 
 # Password validation
 
@@ -108,9 +123,18 @@ REST_FRAMEWORK = {
     ),
 
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.RoleJWTAuthentication',
     ),
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_RENDERER_CLASSES': (
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.CountPageNumberPagination',
     'PAGE_SIZE': 10,
     'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'],
 }
@@ -121,12 +145,54 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+# Сколько секунд процесс доверяет закешированной версии токенов пользователя.
+TOKEN_VERSION_CACHE_TIMEOUT = 60
+
+# Сколько виртуальных оценок, равных средней, добавляется к оценкам
+# произведения в рейтинге `GET /api/v1/titles/top/`.
+RANKING_PRIOR_WEIGHT = 10
+
+# Как долго средняя оценка для рейтинга берётся из кеша, в секундах.
+# Полный пересчёт выполняет `python manage.py rebuild_ratings`.
+RANKING_MEAN_CACHE_TIMEOUT = 3600
+
+# Время жизни закешированных списков категорий и жанров в секундах.
+RESPONSE_CACHE_TIMEOUT = 300
+
+# Время жизни количества объектов для пагинации с `?count=estimate`.
+PAGINATION_COUNT_CACHE_TIMEOUT = 60
+
+# Максимальное число id в `GET /api/v1/titles/?ids=`.
+TITLE_IDS_MAX_LENGTH = 100
+
+# Число подсказок в `GET /api/v1/titles/suggest/?q=`.
+TITLE_SUGGEST_LIMIT = 10
+
+# Как часто, в секундах, индекс подсказок сверяет с базой число
+# произведений, чтобы заметить вставки и удаления из других процессов.
+TITLE_SUGGEST_CHECK_INTERVAL = 5
+
+# Минимальное сходство названия с запросом `GET /api/v1/titles/?fuzzy=`
+# (доля общих триграмм) и максимальное число найденных произведений.
+FUZZY_SEARCH_THRESHOLD = 0.3
+FUZZY_SEARCH_MAX_RESULTS = 100
+
+# Максимальное число подзапросов в одном `POST /api/v1/batch/`.
+BATCH_MAX_REQUESTS = 20
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
 DEFAULT_FROM_EMAIL = 'oXbCt@example.com'
+# Письма с кодом подтверждения складываются в таблицу EmailOutbox
+# и отправляются командой send_outbox_emails, а не внутри запроса.
+EMAIL_OUTBOX_ENABLED = False
+EMAIL_OUTBOX_BATCH_SIZE = 100
+# После стольких неудачных попыток письмо остаётся в очереди с текстом
+# ошибки, но больше не отправляется.
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
 AUTH_USER_MODEL = 'reviews.User'
 
 
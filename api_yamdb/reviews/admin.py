@@ -2,7 +2,7 @@ from django.contrib import admin
 from django.contrib.auth import get_user_model
 from django.contrib.auth.admin import UserAdmin
 
-from .models import Category, Comment, Genre, Review, Title
+from .models import Category, Comment, EmailOutbox, Genre, Review, Title
 
 User = get_user_model()
 
@@ -41,6 +41,13 @@ class ReviewAdmin(admin.ModelAdmin):
     search_fields = ('title',)
 
 
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    list_display = ('recipient', 'subject', 'queued_at', 'attempts')
+    list_filter = ('attempts',)
+    search_fields = ('recipient',)
+
+
 @admin.register(User)
 class UserAdmin(UserAdmin):
     list_display = (
@@ -9,3 +9,9 @@ SLUG_MAX_LENGTH = 50
 TITLE_GENRE_CATEGORY_MAX_LENGTH = 256
 
 CONF_CODE_MAX_LENGTH = 255
+
+EMAIL_SUBJECT_MAX_LENGTH = 255
+
+MIN_SCORE = 1
+
+MAX_SCORE = 10
@@ -0,0 +1,53 @@
+from django.db.models import Count, F, FloatField, Max, Value
+from django.db.models.functions import Cast
+
+from .models import Title, TitleTrigram
+from .search import name_trigrams
+
+
+def build_title_trigrams(title_id, name):
+    trigrams = name_trigrams(name)
+    return [
+        TitleTrigram(title_id=title_id, trigram=trigram, total=len(trigrams))
+        for trigram in trigrams
+    ]
+
+
+def index_title_trigrams(title):
+    TitleTrigram.objects.filter(title_id=title.pk).delete()
+    TitleTrigram.objects.bulk_create(
+        build_title_trigrams(title.pk, title.name)
+    )
+
+
+def rebuild_title_trigrams(batch_size=10000):
+    TitleTrigram.objects.all().delete()
+    batch = []
+    for title_id, name in Title.objects.values_list('id', 'name').iterator():
+        batch.extend(build_title_trigrams(title_id, name))
+        if len(batch) >= batch_size:
+            TitleTrigram.objects.bulk_create(batch)
+            batch = []
+    TitleTrigram.objects.bulk_create(batch)
+
+
+def fuzzy_match_titles(value, threshold, limit):
+    """id произведений, похожих на запрос, по убыванию сходства.
+
+    Сходство — коэффициент Жаккара по множествам триграмм запроса и
+    названия: общие триграммы считаются по индексу `title_trigram_idx`,
+    а число триграмм названия хранится в каждой строке.
+    """
+    trigrams = name_trigrams(value)
+    if not trigrams:
+        return []
+    shared = Count('id')
+    return list(TitleTrigram.objects.filter(
+        trigram__in=trigrams
+    ).values('title_id').annotate(
+        similarity=Cast(shared, FloatField()) / (
+            Value(len(trigrams)) + Max('total') - shared
+        )
+    ).filter(similarity__gte=threshold).order_by(
+        F('similarity').desc(), 'title_id'
+    ).values_list('title_id', flat=True)[:limit])
@@ -1,24 +1,65 @@
 import csv
 import os
+import time
+from itertools import islice
 
 from django.conf import settings
+from django.core.cache import cache
 from django.core.management.base import BaseCommand
+from django.db import transaction
 
-from reviews.models import Category, Comment, Genre, Review, Title, User
+from reviews.fuzzy import rebuild_title_trigrams
+from reviews.models import (Category, Comment, Genre, NormalizedFieldsMixin,
+                            Review, Title, User)
+from reviews.ranking import rebuild_rankings
+from reviews.search import rebuild_title_search_index
 
 TABLES = {
     User: 'users.csv',
     Category: 'category.csv',
     Genre: 'genre.csv',
     Title: 'titles.csv',
+    Title.genre.through: 'genre_title.csv',
     Review: 'review.csv',
     Comment: 'comments.csv',
 }
 
+FOREIGN_KEYS = {
+    Title: {'category': Category},
+    Title.genre.through: {'title_id': Title, 'genre_id': Genre},
+    Review: {'author': User, 'title_id': Title},
+    Comment: {'author': User, 'review_id': Review},
+}
+
+UNIQUE_TOGETHER = {
+    Title.genre.through: ('title_id', 'genre_id'),
+}
+
+BATCH_SIZE = 1000
+
+
+def read_rows(file_path):
+    with open(file_path, 'r', encoding='utf-8') as file:
+        yield from csv.DictReader(file)
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
 
 class Command(BaseCommand):
     help = 'Загрузка данных из CSV файлов в базу данных'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help='Количество строк в одном INSERT'
+        )
+
     def handle(self, *args, **kwargs):
         for model, csv_file in TABLES.items():
             file_path = os.path.join(
@@ -37,33 +78,97 @@ class Command(BaseCommand):
                 continue
 
             try:
-                with open(file_path, 'r', encoding='utf-8') as file:
-                    reader = csv.DictReader(file)
-                    objects = [
-                        model(**self.clean_data(model, row))
-                        for row in reader
-                    ]
-                    model.objects.bulk_create(objects)
+                started = time.perf_counter()
+                with transaction.atomic():
+                    loaded, dangling, duplicates = self.load_table(
+                        model, file_path, kwargs['batch_size']
+                    )
+                elapsed = time.perf_counter() - started
                 self.stdout.write(
                     self.style.SUCCESS(
-                        f'Данные для {model.__name__} успешно загружены'
+                        f'Данные для {model.__name__} успешно загружены: '
+                        f'{loaded} строк за {elapsed:.2f} с '
+                        f'({loaded / max(elapsed, 1e-9):.0f} строк/с)'
                     )
                 )
+                for attname, values in dangling.items():
+                    if values:
+                        self.stdout.write(
+                            self.style.WARNING(
+                                f'Пропущены строки с несуществующими '
+                                f'{attname}: '
+                                f'{", ".join(map(str, sorted(values)))}'
+                            )
+                        )
+                if duplicates:
+                    self.stdout.write(
+                        self.style.WARNING(
+                            f'Пропущены повторяющиеся строки '
+                            f'({", ".join(UNIQUE_TOGETHER[model])}): '
+                            f'{", ".join(map(str, sorted(duplicates)))}'
+                        )
+                    )
             except Exception as error:
                 self.stdout.write(
                     self.style.ERROR(
                         f'Ошибка загрузки для {model.__name__}: {error}'
                     )
                 )
+        Title.objects.all().rebuild_rating()
+        rebuild_rankings()
+        rebuild_title_search_index()
+        rebuild_title_trigrams()
+        # bulk_create не отправляет сигналы, поэтому закешированные
+        # ответы API устаревают вместе с данными.
+        cache.clear()
+
+    def load_table(self, model, file_path, batch_size):
+        related_pks = {
+            self.attname(column): set(
+                related.objects.values_list('pk', flat=True)
+            )
+            for column, related in FOREIGN_KEYS.get(model, {}).items()
+        }
+        dangling = {attname: set() for attname in related_pks}
+        unique_together = UNIQUE_TOGETHER.get(model)
+        seen = set(
+            model.objects.values_list(*unique_together)
+        ) if unique_together else set()
+        duplicates = set()
+        loaded = 0
+        rows = (self.clean_data(model, row) for row in read_rows(file_path))
+        for batch in batched(rows, batch_size):
+            objects = []
+            for row in batch:
+                missing = [
+                    attname for attname, pks in related_pks.items()
+                    if row[attname] is not None and row[attname] not in pks
+                ]
+                for attname in missing:
+                    dangling[attname].add(row[attname])
+                if missing:
+                    continue
+                if unique_together:
+                    key = tuple(row[field] for field in unique_together)
+                    if key in seen:
+                        duplicates.add(key)
+                        continue
+                    seen.add(key)
+                instance = model(**row)
+                if isinstance(instance, NormalizedFieldsMixin):
+                    instance.fill_normalized_fields()
+                objects.append(instance)
+            model.objects.bulk_create(objects)
+            loaded += len(objects)
+        return loaded, dangling, duplicates
+
+    @staticmethod
+    def attname(column):
+        return column if column.endswith('_id') else f'{column}_id'
 
     def clean_data(self, model, row):
         """Очистка данных перед созданием объектов"""
-        if model == Title:
-            row['category'] = Category.objects.get(pk=row['category'])
-        elif model in [Review, Comment]:
-            row['author'] = User.objects.get(pk=row['author'])
-            if model == Review:
-                row['title'] = Title.objects.get(pk=row['title_id'])
-            elif model == Comment:
-                row['review'] = Review.objects.get(pk=row['review_id'])
+        for column in FOREIGN_KEYS.get(model, {}):
+            value = row.pop(column)
+            row[self.attname(column)] = int(value) if value else None
         return row
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from reviews.models import Title
+from reviews.ranking import rebuild_rankings
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчёт сохранённых рейтингов произведений по отзывам '
+        'и сглаженного рейтинга для /titles/top/'
+    )
+
+    def handle(self, *args, **kwargs):
+        updated = Title.objects.all().rebuild_rating()
+        rebuild_rankings()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Рейтинг пересчитан для {updated} произведений'
+            )
+        )
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from reviews.search import rebuild_title_search_index
+
+
+class Command(BaseCommand):
+    help = 'Пересборка полнотекстового индекса произведений'
+
+    def handle(self, *args, **kwargs):
+        indexed = rebuild_title_search_index()
+        self.stdout.write(
+            self.style.SUCCESS(f'В индекс добавлено {indexed} произведений')
+        )
@@ -0,0 +1,86 @@
+import time
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import F
+
+from reviews.models import EmailOutbox
+
+
+class Command(BaseCommand):
+    help = 'Отправка писем из очереди EmailOutbox'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.EMAIL_OUTBOX_BATCH_SIZE,
+            help='Количество писем, отправляемых за один проход'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=0,
+            help='Пауза между проверками очереди в секундах; '
+                 'без параметра очередь разбирается один раз'
+        )
+
+    def handle(self, *args, **kwargs):
+        while True:
+            try:
+                sent, failed = self.drain(kwargs['batch_size'])
+            except Exception as error:
+                # Недоступный почтовый сервер не должен останавливать
+                # обработчик очереди: следующая проверка попробует снова.
+                if not kwargs['interval']:
+                    raise CommandError(f'Ошибка отправки писем: {error}')
+                self.stderr.write(
+                    self.style.ERROR(f'Ошибка отправки писем: {error}')
+                )
+            else:
+                self.stdout.write(self.style.SUCCESS(
+                    f'Отправлено писем: {sent}, с ошибкой: {failed}'
+                ))
+            if not kwargs['interval']:
+                break
+            time.sleep(kwargs['interval'])
+
+    def drain(self, batch_size):
+        """Отправляет письма по одному и удаляет каждое сразу после отправки.
+
+        Письмо, которое не удалось отправить, получает счётчик попыток и
+        текст ошибки, а проход продолжается со следующего письма. После
+        EMAIL_OUTBOX_MAX_ATTEMPTS попыток письмо больше не отправляется.
+        """
+        sent = failed = 0
+        last_pk = 0
+        with get_connection() as connection:
+            while True:
+                batch = list(EmailOutbox.objects.filter(
+                    pk__gt=last_pk,
+                    attempts__lt=settings.EMAIL_OUTBOX_MAX_ATTEMPTS
+                )[:batch_size])
+                if not batch:
+                    return sent, failed
+                for email in batch:
+                    # Письмо, обновлённое повторной регистрацией во время
+                    # отправки, остаётся в очереди до следующего прохода.
+                    queued = EmailOutbox.objects.filter(
+                        pk=email.pk, queued_at=email.queued_at
+                    )
+                    try:
+                        connection.send_messages([EmailMessage(
+                            subject=email.subject,
+                            body=email.message,
+                            to=[email.recipient]
+                        )])
+                    except Exception as error:
+                        queued.update(
+                            attempts=F('attempts') + 1, last_error=str(error)
+                        )
+                        failed += 1
+                    else:
+                        queued.delete()
+                        sent += 1
+                last_pk = batch[-1].pk
@@ -0,0 +1,35 @@
+from django.db import migrations
+
+
+def create_title_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        'CREATE VIRTUAL TABLE reviews_title_fts '
+        "USING fts5(name, description, tokenize='unicode61')"
+    )
+    schema_editor.execute(
+        'INSERT INTO reviews_title_fts (rowid, name, description) '
+        "SELECT id, REPLACE(REPLACE(name, 'ё', 'е'), 'Ё', 'Е'), "
+        "REPLACE(REPLACE(description, 'ё', 'е'), 'Ё', 'Е') "
+        'FROM reviews_title'
+    )
+
+
+def drop_title_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute('DROP TABLE IF EXISTS reviews_title_fts')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0007_review_comment_pub_date_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            create_title_search_index, drop_title_search_index
+        ),
+    ]
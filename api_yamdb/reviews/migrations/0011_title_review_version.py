@@ -0,0 +1,23 @@
+# Generated by Django 3.2.25 on 2026-10-17 06:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0010_user_token_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='version',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Версия'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='version',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Версия'),
+        ),
+    ]
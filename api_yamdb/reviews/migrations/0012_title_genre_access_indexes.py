@@ -0,0 +1,28 @@
+# Generated by Django 3.2.25 on 2026-10-17 06:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0011_title_review_version'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['year'], name='title_year_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['category', 'year'], name='title_category_year_idx'),
+        ),
+        # У автоматической промежуточной таблицы нет Meta, поэтому индекс
+        # для выборки произведений по жанру создаётся вручную.
+        migrations.RunSQL(
+            'CREATE INDEX "title_genre_genre_title_idx" '
+            'ON "reviews_title_genre" ("genre_id", "title_id");',
+            'DROP INDEX "title_genre_genre_title_idx";',
+        ),
+    ]
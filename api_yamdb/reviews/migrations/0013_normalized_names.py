@@ -0,0 +1,63 @@
+# Generated by Django 3.2.25 on 2026-10-17 06:32
+
+from django.db import migrations, models
+
+from reviews.search import normalize_name
+
+NORMALIZED_FIELDS = {
+    'Category': ('name_normalized', 'name'),
+    'Genre': ('name_normalized', 'name'),
+    'Title': ('name_normalized', 'name'),
+    'User': ('username_normalized', 'username'),
+}
+
+
+BATCH_SIZE = 1000
+
+
+def fill_normalized_names(apps, schema_editor):
+    for model_name, (shadow, source) in NORMALIZED_FIELDS.items():
+        model = apps.get_model('reviews', model_name)
+        max_length = model._meta.get_field(shadow).max_length
+        objects = []
+        queryset = model.objects.only('pk', source).order_by('pk')
+        for obj in queryset.iterator(chunk_size=BATCH_SIZE):
+            setattr(
+                obj, shadow, normalize_name(getattr(obj, source))[:max_length]
+            )
+            objects.append(obj)
+            if len(objects) >= BATCH_SIZE:
+                model.objects.bulk_update(objects, [shadow])
+                objects = []
+        model.objects.bulk_update(objects, [shadow])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0012_title_genre_access_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='name_normalized',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=256),
+        ),
+        migrations.AddField(
+            model_name='genre',
+            name='name_normalized',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=256),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='name_normalized',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=256),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='username_normalized',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=150),
+        ),
+        migrations.RunPython(fill_normalized_names, migrations.RunPython.noop),
+    ]
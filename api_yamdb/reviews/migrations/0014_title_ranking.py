@@ -0,0 +1,40 @@
+# Generated by Django 3.2.25 on 2026-10-17 06:40
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F, FloatField, Sum, Value
+from django.db.models.expressions import ExpressionWrapper
+
+
+def fill_title_ranking(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    totals = Title.objects.aggregate(
+        score=Sum('rating_sum'), count=Sum('rating_count')
+    )
+    mean = totals['score'] / totals['count'] if totals['count'] else 5.5
+    weight = settings.RANKING_PRIOR_WEIGHT
+    Title.objects.update(ranking=ExpressionWrapper(
+        (Value(float(mean * weight)) + F('rating_sum'))
+        / (Value(float(weight)) + F('rating_count')),
+        output_field=FloatField()
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0013_normalized_names'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='ranking',
+            field=models.FloatField(default=0, editable=False, verbose_name='Байесовский рейтинг'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['-ranking', 'id'], name='title_ranking_idx'),
+        ),
+        migrations.RunPython(fill_title_ranking, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 3.2.25 on 2026-10-17 06:41
+
+from django.db import migrations, models
+from django.db.models import F, FloatField, Value
+from django.db.models.expressions import ExpressionWrapper
+
+
+def fill_title_rating_avg(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Title.objects.filter(rating_count__gt=0).update(
+        rating_avg=ExpressionWrapper(
+            F('rating_sum') * Value(1.0) / F('rating_count'),
+            output_field=FloatField()
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0014_title_ranking'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='rating_avg',
+            field=models.FloatField(editable=False, null=True, verbose_name='Средняя оценка'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['rating_avg'], name='title_rating_avg_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['rating_count'], name='title_rating_count_idx'),
+        ),
+        migrations.RunPython(fill_title_rating_avg, migrations.RunPython.noop),
+    ]
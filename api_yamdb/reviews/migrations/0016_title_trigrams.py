@@ -0,0 +1,56 @@
+# Generated by Django 3.2.25 on 2026-10-17 06:54
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+from reviews.search import name_trigrams
+
+
+BATCH_SIZE = 1000
+
+
+def fill_title_trigrams(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    TitleTrigram = apps.get_model('reviews', 'TitleTrigram')
+    rows = []
+    titles = Title.objects.values_list('id', 'name')
+    for title_id, name in titles.iterator(chunk_size=BATCH_SIZE):
+        trigrams = name_trigrams(name)
+        rows.extend(
+            TitleTrigram(
+                title_id=title_id, trigram=trigram, total=len(trigrams)
+            )
+            for trigram in trigrams
+        )
+        if len(rows) >= BATCH_SIZE:
+            TitleTrigram.objects.bulk_create(rows)
+            rows = []
+    TitleTrigram.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0015_title_ordering_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleTrigram',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('trigram', models.CharField(max_length=3, verbose_name='Триграмма')),
+                ('total', models.PositiveSmallIntegerField(verbose_name='Триграмм в названии')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='trigrams', to='reviews.title', verbose_name='Произведение')),
+            ],
+            options={
+                'verbose_name': 'Триграмма названия',
+                'verbose_name_plural': 'Триграммы названий',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='titletrigram',
+            index=models.Index(fields=['trigram', 'title', 'total'], name='title_trigram_idx'),
+        ),
+        migrations.RunPython(fill_title_trigrams, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 3.2.25 on 2026-10-17 07:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0016_title_trigrams'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='emailoutbox',
+            name='attempts',
+            field=models.PositiveSmallIntegerField(default=0, verbose_name='Неудачных попыток отправки'),
+        ),
+        migrations.AddField(
+            model_name='emailoutbox',
+            name='last_error',
+            field=models.TextField(blank=True, verbose_name='Последняя ошибка отправки'),
+        ),
+    ]
@@ -1,15 +1,19 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.db import models, transaction
+from django.db.models import (Case, Count, ExpressionWrapper, F, FloatField,
+                              OuterRef, Subquery, Sum, Value, When)
+from django.db.models.functions import Coalesce
 from django.contrib.auth.tokens import default_token_generator
 from django.utils.http import urlsafe_base64_encode
 from django.core.mail import send_mail
 from django.template.loader import render_to_string
 
 from .constants import (
-    EMAIL_MAX_LENGTH, NAME_MAX_LENGTH, SLUG_MAX_LENGTH,
-    USERNAME_MAX_LENGTH, TITLE_GENRE_CATEGORY_MAX_LENGTH
+    EMAIL_MAX_LENGTH, EMAIL_SUBJECT_MAX_LENGTH, NAME_MAX_LENGTH,
+    SLUG_MAX_LENGTH, USERNAME_MAX_LENGTH, TITLE_GENRE_CATEGORY_MAX_LENGTH
 )
+from .search import normalize_name
 from .validators import validate_score, validate_username, validate_year
 
 ROLE_USER = 'user'
@@ -23,7 +27,50 @@ class RoleChoices(models.TextChoices):
     MODERATOR = ROLE_MODERATOR, 'Moderator'
 
 
-class User(AbstractUser):
+class UserRoleMixin:
+    @property
+    def is_admin(self):
+        return (
+            self.role == RoleChoices.ADMIN
+            or self.is_staff
+            or self.is_superuser
+        )
+
+    @property
+    def is_moderator(self):
+        return self.role == RoleChoices.MODERATOR
+
+
+class NormalizedFieldsMixin:
+    """Поддерживает индексируемые нормализованные копии текстовых полей.
+
+    `normalized_fields` сопоставляет теневое поле исходному. bulk_create не
+    вызывает save(), поэтому массовая загрузка вызывает
+    `fill_normalized_fields()` сама.
+    """
+
+    normalized_fields = {}
+
+    def fill_normalized_fields(self):
+        for shadow, source in self.normalized_fields.items():
+            max_length = self._meta.get_field(shadow).max_length
+            setattr(
+                self, shadow,
+                normalize_name(getattr(self, source) or '')[:max_length]
+            )
+
+    def save(self, *args, **kwargs):
+        self.fill_normalized_fields()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, *(
+                shadow for shadow, source in self.normalized_fields.items()
+                if source in update_fields
+            )}
+        super().save(*args, **kwargs)
+
+
+class User(NormalizedFieldsMixin, UserRoleMixin, AbstractUser):
     username = models.CharField(
         validators=[validate_username],
         max_length=USERNAME_MAX_LENGTH,
@@ -54,18 +101,19 @@ class User(AbstractUser):
         blank=True,
         null=True
     )
+    token_version = models.PositiveIntegerField(
+        'Версия токенов',
+        default=0,
+        editable=False
+    )
+    username_normalized = models.CharField(
+        max_length=USERNAME_MAX_LENGTH,
+        default='',
+        editable=False,
+        db_index=True
+    )
 
-    @property
-    def is_admin(self):
-        return (
-            self.role == RoleChoices.ADMIN
-            or self.is_staff
-            or self.is_superuser
-        )
-
-    @property
-    def is_moderator(self):
-        return self.role == RoleChoices.MODERATOR
+    normalized_fields = {'username_normalized': 'username'}
 
     class Meta:
         ordering = ['username']
@@ -94,7 +142,7 @@ class User(AbstractUser):
         send_mail(subject, message, 'from@example.com', [self.email])
 
 
-class CategoryGenreBaseModel(models.Model):
+class CategoryGenreBaseModel(NormalizedFieldsMixin, models.Model):
     name = models.CharField(
         max_length=TITLE_GENRE_CATEGORY_MAX_LENGTH,
         verbose_name='Название'
@@ -104,6 +152,14 @@ class CategoryGenreBaseModel(models.Model):
         unique=True,
         verbose_name='Слаг',
     )
+    name_normalized = models.CharField(
+        max_length=TITLE_GENRE_CATEGORY_MAX_LENGTH,
+        default='',
+        editable=False,
+        db_index=True
+    )
+
+    normalized_fields = {'name_normalized': 'name'}
 
     class Meta:
         abstract = True
@@ -125,7 +181,49 @@ class Genre(CategoryGenreBaseModel):
         verbose_name_plural = 'Жанры'
 
 
-class Title(models.Model):
+class TitleQuerySet(models.QuerySet):
+    def rebuild_rating(self):
+        reviews = Review.objects.filter(
+            title=OuterRef('pk')
+        ).order_by().values('title')
+        return self.update(
+            rating_sum=Coalesce(
+                Subquery(reviews.annotate(total=Sum('score')).values('total')),
+                0
+            ),
+            rating_count=Coalesce(
+                Subquery(reviews.annotate(total=Count('id')).values('total')),
+                0
+            ),
+            version=F('version') + 1,
+        )
+
+    def rebuild_ranking(self, mean, weight):
+        """Пересчитывает среднюю оценку и сглаженный (байесовский) рейтинг.
+
+        К настоящим оценкам добавляются `weight` виртуальных оценок,
+        равных средней `mean`, поэтому одна оценка 10 не выводит
+        произведение в лидеры.
+        """
+        return self.update(
+            rating_avg=Case(
+                When(rating_count=0, then=Value(None)),
+                default=ExpressionWrapper(
+                    F('rating_sum') * Value(1.0) / F('rating_count'),
+                    output_field=FloatField()
+                ),
+                output_field=FloatField()
+            ),
+            ranking=ExpressionWrapper(
+                (Value(float(mean * weight)) + F('rating_sum'))
+                / (Value(float(weight)) + F('rating_count')),
+                output_field=FloatField()
+            ),
+            version=F('version') + 1,
+        )
+
+
+class Title(NormalizedFieldsMixin, models.Model):
     name = models.CharField(
         max_length=TITLE_GENRE_CATEGORY_MAX_LENGTH,
         verbose_name='Название произведения'
@@ -151,16 +249,99 @@ class Title(models.Model):
         related_name='titles',
         verbose_name='Жанры'
     )
+    rating_sum = models.PositiveIntegerField(
+        'Сумма оценок',
+        default=0,
+        editable=False
+    )
+    rating_count = models.PositiveIntegerField(
+        'Количество оценок',
+        default=0,
+        editable=False
+    )
+    version = models.PositiveIntegerField(
+        'Версия',
+        default=0,
+        editable=False
+    )
+    name_normalized = models.CharField(
+        max_length=TITLE_GENRE_CATEGORY_MAX_LENGTH,
+        default='',
+        editable=False,
+        db_index=True
+    )
+    rating_avg = models.FloatField(
+        'Средняя оценка',
+        null=True,
+        editable=False
+    )
+    ranking = models.FloatField(
+        'Байесовский рейтинг',
+        default=0,
+        editable=False
+    )
+
+    objects = TitleQuerySet.as_manager()
+
+    normalized_fields = {'name_normalized': 'name'}
+
+    @property
+    def rating(self):
+        if not self.rating_count:
+            return None
+        return self.rating_sum / self.rating_count
 
     class Meta:
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
         ordering = ['name']
+        indexes = [
+            models.Index(fields=['year'], name='title_year_idx'),
+            models.Index(
+                fields=['category', 'year'],
+                name='title_category_year_idx'
+            ),
+            models.Index(
+                fields=['-ranking', 'id'],
+                name='title_ranking_idx'
+            ),
+            models.Index(fields=['rating_avg'], name='title_rating_avg_idx'),
+            models.Index(
+                fields=['rating_count'],
+                name='title_rating_count_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.name
 
 
+class TitleTrigram(models.Model):
+    """Триграмма названия произведения для нечёткого поиска."""
+
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='trigrams',
+        verbose_name='Произведение'
+    )
+    trigram = models.CharField('Триграмма', max_length=3)
+    total = models.PositiveSmallIntegerField('Триграмм в названии')
+
+    class Meta:
+        verbose_name = 'Триграмма названия'
+        verbose_name_plural = 'Триграммы названий'
+        indexes = [
+            models.Index(
+                fields=['trigram', 'title', 'total'],
+                name='title_trigram_idx'
+            )
+        ]
+
+    def __str__(self):
+        return f'{self.trigram} в {self.title_id}'
+
+
 class Review(models.Model):
     title = models.ForeignKey(
         Title,
@@ -184,6 +365,21 @@ class Review(models.Model):
         auto_now_add=True,
         db_index=True
     )
+    version = models.PositiveIntegerField(
+        'Версия',
+        default=0,
+        editable=False
+    )
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_score = instance.__dict__.get('score')
+        return instance
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            super().save(*args, **kwargs)
 
     class Meta:
         verbose_name = 'Отзыв'
@@ -194,6 +390,12 @@ class Review(models.Model):
                 name='unique_review_per_author_per_title'
             )
         ]
+        indexes = [
+            models.Index(
+                fields=['title', 'pub_date', 'id'],
+                name='review_title_pub_date_idx'
+            )
+        ]
         ordering = ['pub_date']
 
     def __str__(self):
@@ -223,7 +425,40 @@ class Comment(models.Model):
     class Meta:
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = [
+            models.Index(
+                fields=['review', 'pub_date', 'id'],
+                name='comment_review_pub_date_idx'
+            )
+        ]
         ordering = ['pub_date']
 
     def __str__(self):
         return f'Комментарий {self.author} на {self.review}'
+
+
+class EmailOutbox(models.Model):
+    recipient = models.EmailField(
+        'Получатель',
+        max_length=EMAIL_MAX_LENGTH,
+        unique=True
+    )
+    subject = models.CharField('Тема', max_length=EMAIL_SUBJECT_MAX_LENGTH)
+    message = models.TextField('Текст письма')
+    queued_at = models.DateTimeField(
+        'Дата постановки в очередь',
+        auto_now=True
+    )
+    attempts = models.PositiveSmallIntegerField(
+        'Неудачных попыток отправки',
+        default=0
+    )
+    last_error = models.TextField('Последняя ошибка отправки', blank=True)
+
+    class Meta:
+        verbose_name = 'Письмо в очереди'
+        verbose_name_plural = 'Очередь писем'
+        ordering = ['id']
+
+    def __str__(self):
+        return f'Письмо для {self.recipient}'
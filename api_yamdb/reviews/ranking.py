@@ -0,0 +1,46 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Sum
+
+from .constants import MAX_SCORE, MIN_SCORE
+from .models import Title
+
+RANKING_MEAN_CACHE_KEY = 'reviews:ranking-mean'
+
+
+def mean_score():
+    """Средняя оценка по всем отзывам, по счётчикам произведений."""
+    totals = Title.objects.aggregate(
+        score=Sum('rating_sum'), count=Sum('rating_count')
+    )
+    if not totals['count']:
+        return (MIN_SCORE + MAX_SCORE) / 2
+    return totals['score'] / totals['count']
+
+
+def get_mean_score():
+    mean = cache.get(RANKING_MEAN_CACHE_KEY)
+    if mean is None:
+        mean = mean_score()
+        cache.set(
+            RANKING_MEAN_CACHE_KEY, mean, settings.RANKING_MEAN_CACHE_TIMEOUT
+        )
+    return mean
+
+
+def refresh_ranking(titles):
+    """Обновляет рейтинг части произведений по закешированной средней."""
+    return titles.rebuild_ranking(
+        get_mean_score(), settings.RANKING_PRIOR_WEIGHT
+    )
+
+
+def rebuild_rankings():
+    """Пересчитывает среднюю и рейтинг всех произведений."""
+    mean = mean_score()
+    cache.set(
+        RANKING_MEAN_CACHE_KEY, mean, settings.RANKING_MEAN_CACHE_TIMEOUT
+    )
+    return Title.objects.all().rebuild_ranking(
+        mean, settings.RANKING_PRIOR_WEIGHT
+    )
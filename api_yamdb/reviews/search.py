@@ -0,0 +1,133 @@
+import re
+
+from django.db import connection
+
+TITLE_SEARCH_TABLE = 'reviews_title_fts'
+
+SEARCH_TERM_PATTERN = re.compile(r'\w+')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
+def is_search_supported():
+    return connection.vendor == 'sqlite'
+
+
+def normalize_search_text(value):
+    return value.replace('ё', 'е').replace('Ё', 'Е')
+
+
+def normalize_name(value):
+    """Форма названия для поиска без учёта регистра, ё и лишних пробелов."""
+    return WHITESPACE_PATTERN.sub(
+        ' ', normalize_search_text(value).casefold()
+    ).strip()
+
+
+# Кириллица переводится в латиницу, а латинские буквы, которые пишут
+# по-разному для одного звука, сводятся к одной: «Война», «Voina» и
+# «Vojna» дают одно и то же.
+TRANSLITERATION = str.maketrans({
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'е': 'e', 'ж': 'zh',
+    'з': 'z', 'и': 'i', 'й': 'i', 'к': 'k', 'л': 'l', 'м': 'm', 'н': 'n',
+    'о': 'o', 'п': 'p', 'р': 'r', 'с': 's', 'т': 't', 'у': 'u', 'ф': 'f',
+    'х': 'h', 'ц': 'ts', 'ч': 'ch', 'ш': 'sh', 'щ': 'sch', 'ъ': '',
+    'ы': 'i', 'ь': '', 'э': 'e', 'ю': 'iu', 'я': 'ia',
+    'j': 'i', 'y': 'i', 'w': 'v', 'q': 'k', 'x': 'ks',
+})
+LATIN_VARIANTS = (
+    (re.compile(r'c(?!h)'), 'k'),
+    (re.compile(r'ph'), 'f'),
+)
+
+
+def transliterate(value):
+    """Латинская форма названия для сравнения русских и латинских написаний."""
+    value = normalize_name(value).translate(TRANSLITERATION)
+    for pattern, replacement in LATIN_VARIANTS:
+        value = pattern.sub(replacement, value)
+    return value
+
+
+def name_trigrams(value):
+    """Триграммы слов названия, дополненных пробелом с каждой стороны.
+
+    В отличие от pg_trgm, слово не дополняется вторым пробелом в начале:
+    триграммы вида «  к» есть почти у каждого названия и лишь замедляют
+    поиск, не влияя на полноту (benchmarks/bench_title_fuzzy.py).
+    """
+    trigrams = set()
+    for word in SEARCH_TERM_PATTERN.findall(transliterate(value)):
+        padded = f' {word} '
+        trigrams.update(
+            padded[start:start + 3] for start in range(len(padded) - 2)
+        )
+    return trigrams
+
+
+def build_search_query(value):
+    """Превращает ввод пользователя в запрос FTS5 с поиском по префиксам."""
+    terms = SEARCH_TERM_PATTERN.findall(normalize_search_text(value))
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def index_title(title):
+    if not is_search_supported():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {TITLE_SEARCH_TABLE} WHERE rowid = %s', [title.pk]
+        )
+        cursor.execute(
+            f'INSERT INTO {TITLE_SEARCH_TABLE} (rowid, name, description) '
+            'VALUES (%s, %s, %s)',
+            [
+                title.pk,
+                normalize_search_text(title.name),
+                normalize_search_text(title.description),
+            ]
+        )
+
+
+def unindex_title(title_id):
+    if not is_search_supported():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {TITLE_SEARCH_TABLE} WHERE rowid = %s', [title_id]
+        )
+
+
+def rebuild_title_search_index():
+    if not is_search_supported():
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {TITLE_SEARCH_TABLE}')
+        cursor.execute(
+            f'INSERT INTO {TITLE_SEARCH_TABLE} (rowid, name, description) '
+            "SELECT id, REPLACE(REPLACE(name, 'ё', 'е'), 'Ё', 'Е'), "
+            "REPLACE(REPLACE(description, 'ё', 'е'), 'Ё', 'Е') "
+            'FROM reviews_title'
+        )
+        return cursor.rowcount
+
+
+def search_titles(queryset, value):
+    """Фильтрует произведения по полнотекстовому запросу.
+
+    Результаты упорядочены по релевантности (bm25). На базах, отличных от
+    SQLite, выполняется обычный поиск по вхождению подстроки.
+    """
+    query = build_search_query(value)
+    if not query:
+        return queryset.none()
+    if not is_search_supported():
+        return queryset.filter(name__icontains=value)
+    return queryset.extra(
+        tables=[TITLE_SEARCH_TABLE],
+        where=[
+            f'{TITLE_SEARCH_TABLE}.rowid = reviews_title.id',
+            f'{TITLE_SEARCH_TABLE} MATCH %s',
+        ],
+        params=[query],
+        select={'search_rank': f'{TITLE_SEARCH_TABLE}.rank'},
+    ).order_by('search_rank', 'id')
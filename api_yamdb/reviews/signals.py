@@ -0,0 +1,77 @@
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .fuzzy import index_title_trigrams
+from .models import Comment, Review, Title
+from .ranking import refresh_ranking
+from .search import index_title, unindex_title
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_review_save(sender, instance, created, **kwargs):
+    titles = Title.objects.filter(pk=instance.title_id)
+    loaded_score = getattr(instance, '_loaded_score', None)
+    changes = {'version': F('version') + 1}
+    if created:
+        changes.update(
+            rating_sum=F('rating_sum') + instance.score,
+            rating_count=F('rating_count') + 1
+        )
+    elif loaded_score is None:
+        titles.rebuild_rating()
+    elif instance.score != loaded_score:
+        changes.update(
+            rating_sum=F('rating_sum') + instance.score - loaded_score
+        )
+    titles.update(**changes)
+    if 'rating_sum' in changes or loaded_score is None:
+        refresh_ranking(titles)
+    instance._loaded_score = instance.score
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_review_delete(sender, instance, **kwargs):
+    titles = Title.objects.filter(pk=instance.title_id)
+    titles.update(
+        rating_sum=F('rating_sum') - instance.score,
+        rating_count=F('rating_count') - 1,
+        version=F('version') + 1
+    )
+    refresh_ranking(titles)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def bump_review_version(sender, instance, **kwargs):
+    Review.objects.filter(pk=instance.review_id).update(
+        version=F('version') + 1
+    )
+
+
+@receiver(post_save, sender=Title)
+def index_title_on_save(sender, instance, **kwargs):
+    index_title(instance)
+    index_title_trigrams(instance)
+
+
+@receiver(post_save, sender=Title)
+def bump_title_version_on_save(sender, instance, **kwargs):
+    Title.objects.filter(pk=instance.pk).update(version=F('version') + 1)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def bump_title_version_on_genre_change(sender, instance, action, reverse,
+                                       pk_set, **kwargs):
+    if not action.startswith('post_'):
+        return
+    titles = (
+        Title.objects.filter(pk__in=pk_set or ()) if reverse
+        else Title.objects.filter(pk=instance.pk)
+    )
+    titles.update(version=F('version') + 1)
+
+
+@receiver(post_delete, sender=Title)
+def unindex_title_on_delete(sender, instance, **kwargs):
+    unindex_title(instance.pk)
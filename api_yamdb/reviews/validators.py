@@ -3,6 +3,8 @@ import re
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 
+from .constants import MAX_SCORE, MIN_SCORE
+
 
 def validate_username(value):
     if value == 'me':
@@ -23,7 +25,7 @@ def validate_year(value):
 
 
 def validate_score(value):
-    if value < 1 or value > 10:
+    if value < MIN_SCORE or value > MAX_SCORE:
         raise ValidationError(
-            'Оценка должна быть в диапазоне от 1 до 10.'
+            f'Оценка должна быть в диапазоне от {MIN_SCORE} до {MAX_SCORE}.'
         )
@@ -0,0 +1,91 @@
+"""Сравнение стратегий фильтрации по нескольким жанрам.
+
+OR: JOIN с DISTINCT против подзапроса `pk IN (...)` из `genre__in`.
+AND: GROUP BY ... HAVING COUNT против JOIN на каждый жанр из `genre_all`.
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.bench_genre_filter --titles 100000 --genres 50
+"""
+import argparse
+from benchmarks.utils import (assign_genres, create_catalog, measure,
+                              setup_django)
+
+# Наборы слагов: популярные, редкие и смешанные жанры.
+GENRE_SETS = (
+    ('genre-0', 'genre-1'),
+    ('genre-0', 'genre-1', 'genre-2'),
+    ('genre-30', 'genre-45'),
+    ('genre-0', 'genre-40'),
+    ('genre-0', 'genre-1', 'genre-2', 'genre-3'),
+    ('genre-0', 'genre-1', 'genre-2', 'genre-3', 'genre-4', 'genre-5'),
+    ('genre-0', 'genre-10', 'genre-20', 'genre-30', 'genre-40'),
+)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--titles', type=int, default=100_000)
+    parser.add_argument('--genres', type=int, default=50)
+    parser.add_argument('--db', default=None)
+    args = parser.parse_args()
+
+    setup_django(args.db)
+    from django.db import connection
+    from django.db.models import Count
+
+    from api.filters import TitleFilter
+    from reviews.models import Title
+
+    create_catalog(args.titles)
+    assign_genres(args.genres)
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+    queryset = Title.objects.order_by('id')
+    title_filter = TitleFilter(queryset=queryset)
+
+    def page(titles):
+        return titles.count(), list(titles[:10])
+
+    def join_any(slugs):
+        return page(queryset.filter(genre__slug__in=slugs).distinct())
+
+    def having_all(slugs):
+        return page(queryset.filter(pk__in=Title.genre.through.objects.filter(
+            genre__slug__in=slugs
+        ).values('title_id').annotate(
+            matched=Count('genre_id')
+        ).filter(matched=len(slugs)).values('title_id')))
+
+    def filter_any(slugs):
+        return page(
+            title_filter.filter_genre_any(queryset, 'genre__in', slugs)
+        )
+
+    def filter_all(slugs):
+        return page(
+            title_filter.filter_genre_all(queryset, 'genre_all', slugs)
+        )
+
+    for slugs in GENRE_SETS:
+        assert join_any(slugs) == filter_any(slugs)
+        assert having_all(slugs) == filter_all(slugs)
+
+    print(
+        f'{"genres":<50}{"OR join":>10}{"OR in":>10}'
+        f'{"AND having":>12}{"AND join":>10}{"matches":>10}'
+    )
+    for slugs in GENRE_SETS:
+        print(
+            f'{",".join(slugs):<50}'
+            f'{measure(lambda: join_any(slugs)):>10.2f}'
+            f'{measure(lambda: filter_any(slugs)):>10.2f}'
+            f'{measure(lambda: having_all(slugs)):>12.2f}'
+            f'{measure(lambda: filter_all(slugs)):>10.2f}'
+            f'{filter_all(slugs)[0]:>10}'
+        )
+    print('Время в миллисекундах: COUNT(*) и первая страница из 10 строк.')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""Сравнение FastJSONRenderer/FastJSONParser со стандартными классами DRF.
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.bench_json_renderer --page-size 100
+"""
+import argparse
+from collections import OrderedDict
+from io import BytesIO
+
+from benchmarks.utils import create_catalog, measure, setup_django
+
+
+def create_reviews(title, count):
+    from reviews.models import Review, User
+
+    users = [
+        User.objects.create(
+            username=f'user{idx}', email=f'user{idx}@yamdb.fake'
+        )
+        for idx in range(count)
+    ]
+    Review.objects.bulk_create(
+        Review(
+            title=title,
+            author=user,
+            text='Отличный фильм, пересматриваю каждый год. ' * 5,
+            score=idx % 10 + 1,
+        )
+        for idx, user in enumerate(users)
+    )
+
+
+def page(results):
+    return OrderedDict((
+        ('count', len(results)),
+        ('next', 'http://testserver/api/v1/titles/?page=2'),
+        ('previous', None),
+        ('results', results),
+    ))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+
+    from api.parsers import FastJSONParser
+    from api.renderers import FastJSONRenderer, orjson
+    from api.serializers import ReviewSerializer, TitleGetSerializer
+    from reviews.models import Genre, Review, Title
+
+    create_catalog(args.page_size)
+    genres = [
+        Genre.objects.create(name=f'Жанр {idx}', slug=f'genre-{idx}')
+        for idx in range(3)
+    ]
+    for title in Title.objects.all():
+        title.genre.set(genres)
+    create_reviews(Title.objects.first(), args.page_size)
+
+    payloads = {
+        'titles': page(TitleGetSerializer(
+            Title.objects.select_related('category').prefetch_related(
+                'genre'
+            ),
+            many=True
+        ).data),
+        'reviews': page(ReviewSerializer(
+            Review.objects.select_related('author'), many=True
+        ).data),
+    }
+
+    print(f'orjson: {"есть" if orjson else "нет, стандартный json"}')
+    print(f'{"payload":<10}{"operation":<10}{"drf, ms":>10}{"fast, ms":>10}')
+    for name, data in payloads.items():
+        body = JSONRenderer().render(data)
+        assert FastJSONRenderer().render(data) == body
+        for operation, drf, fast in (
+            ('render', lambda: JSONRenderer().render(data),
+             lambda: FastJSONRenderer().render(data)),
+            ('parse', lambda: JSONParser().parse(BytesIO(body)),
+             lambda: FastJSONParser().parse(BytesIO(body))),
+        ):
+            print(
+                f'{name:<10}{operation:<10}'
+                f'{measure(drf, args.repeat):>10.3f}'
+                f'{measure(fast, args.repeat):>10.3f}'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+"""Нечёткий поиск по триграммам: задержка и полнота.
+
+Из каталога берутся случайные названия и искажаются так, как их вводят
+пользователи: одна опечатка в слове, пропуск буквы, перестановка соседних
+букв или латинская транслитерация кириллицы по упрощённой таблице,
+отличной от той, что использует индекс. Полнота — доля запросов, для
+которых искомое произведение попало в первые 10 результатов. Для
+сравнения то же считается для `name__icontains`.
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.bench_title_fuzzy --titles 100000
+"""
+import argparse
+import random
+import statistics
+import time
+
+from benchmarks.utils import create_catalog, setup_django
+
+TOP = 10
+
+# Транслитерация «как получится»: й → y, х → kh, ц → c и так далее.
+USER_TRANSLITERATION = str.maketrans({
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'е': 'e', 'ё': 'yo',
+    'ж': 'zh', 'з': 'z', 'и': 'i', 'й': 'y', 'к': 'k', 'л': 'l', 'м': 'm',
+    'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r', 'с': 's', 'т': 't', 'у': 'u',
+    'ф': 'f', 'х': 'kh', 'ц': 'c', 'ч': 'ch', 'ш': 'sh', 'щ': 'shch',
+    'ы': 'y', 'э': 'e', 'ю': 'yu', 'я': 'ya', 'ь': '', 'ъ': '',
+})
+LETTERS = 'абвгдеклмнопрстabdeklmnoprst'
+
+
+def substitute(rnd, word):
+    position = rnd.randrange(len(word))
+    return word[:position] + rnd.choice(LETTERS) + word[position + 1:]
+
+
+def delete(rnd, word):
+    position = rnd.randrange(len(word))
+    return word[:position] + word[position + 1:]
+
+
+def transpose(rnd, word):
+    position = rnd.randrange(len(word) - 1)
+    return (
+        word[:position] + word[position + 1] + word[position]
+        + word[position + 2:]
+    )
+
+
+def misspell(rnd, name, mutation):
+    words = name.split()
+    candidates = [idx for idx, word in enumerate(words) if len(word) > 3]
+    if not candidates:
+        return None
+    idx = rnd.choice(candidates)
+    words[idx] = mutation(rnd, words[idx])
+    return ' '.join(words)
+
+
+def transliterate(rnd, name):
+    latin = name.lower().translate(USER_TRANSLITERATION)
+    return latin if latin != name.lower() else None
+
+
+MUTATIONS = {
+    'substitution': lambda rnd, name: misspell(rnd, name, substitute),
+    'deletion': lambda rnd, name: misspell(rnd, name, delete),
+    'transposition': lambda rnd, name: misspell(rnd, name, transpose),
+    'transliteration': transliterate,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--titles', type=int, default=100_000)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--db', default=None)
+    args = parser.parse_args()
+
+    setup_django(args.db)
+    from django.conf import settings
+
+    from reviews.fuzzy import fuzzy_match_titles, rebuild_title_trigrams
+    from reviews.models import Title
+
+    create_catalog(args.titles)
+    started = time.perf_counter()
+    rebuild_title_trigrams()
+    print(
+        f'Триграммы построены за {time.perf_counter() - started:.1f} с, '
+        f'{args.titles} произведений.'
+    )
+    rnd = random.Random(1)
+    sample = list(Title.objects.values_list('id', 'name').order_by('?')[
+        :args.queries * 3
+    ])
+
+    def fuzzy(value):
+        return fuzzy_match_titles(
+            value, settings.FUZZY_SEARCH_THRESHOLD, TOP
+        )
+
+    def icontains(value):
+        return list(Title.objects.filter(
+            name__icontains=value
+        ).values_list('id', flat=True)[:TOP])
+
+    print(
+        f'{"mutation":<17}{"queries":>8}{"fuzzy recall":>14}'
+        f'{"p50, ms":>9}{"p95, ms":>9}{"icontains recall":>18}'
+    )
+    for mutation_name, mutation in MUTATIONS.items():
+        queries = [
+            (title_id, query) for title_id, query in (
+                (title_id, mutation(rnd, name)) for title_id, name in sample
+            ) if query
+        ][:args.queries]
+        found = {'fuzzy': 0, 'icontains': 0}
+        timings = []
+        for title_id, query in queries:
+            started = time.perf_counter()
+            ids = fuzzy(query)
+            timings.append((time.perf_counter() - started) * 1000)
+            found['fuzzy'] += title_id in ids
+            found['icontains'] += title_id in icontains(query)
+        timings.sort()
+        print(
+            f'{mutation_name:<17}{len(queries):>8}'
+            f'{found["fuzzy"] / len(queries):>14.2f}'
+            f'{statistics.median(timings):>9.1f}'
+            f'{timings[int(len(timings) * 0.95)]:>9.1f}'
+            f'{found["icontains"] / len(queries):>18.2f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""Сортировка произведений по индексированным колонкам и по агрегатам.
+
+Для каждого поля `?ordering=` сравнивается запрос страницы через
+`IndexedOrderingFilter` с тем же порядком, вычисляемым на лету: агрегатом
+по отзывам или выражением, которое не может использовать индекс.
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.bench_title_ordering --titles 100000
+"""
+import argparse
+
+from benchmarks.utils import (create_catalog, create_reviews, measure,
+                              setup_django)
+
+PAGE_SIZE = 10
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--titles', type=int, default=100_000)
+    parser.add_argument('--db', default=None)
+    args = parser.parse_args()
+
+    setup_django(args.db)
+    from django.db import connection
+    from django.db.models import Avg, Count, F
+    from django.db.models.functions import Lower
+
+    from api.views import TitleViewSet
+    from reviews.models import Title
+
+    create_catalog(args.titles)
+    create_reviews()
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+    queryset = Title.objects.all()
+    columns = TitleViewSet.ordering_fields
+    baselines = {
+        'rating': queryset.annotate(value=Avg('reviews__score')),
+        'reviews_count': queryset.annotate(value=Count('reviews')),
+        'year': queryset.annotate(value=F('year') + 0),
+        'name': queryset.annotate(value=Lower('name')),
+    }
+
+    def plan(titles):
+        sql, params = titles.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            return 'sort' if any(
+                'TEMP B-TREE' in row[-1] for row in cursor.fetchall()
+            ) else 'index'
+
+    print(
+        f'{"ordering":<16}{"offset":>8}{"indexed, ms":>14}{"plan":>7}'
+        f'{"computed, ms":>15}{"plan":>7}'
+    )
+    for name, column in columns.items():
+        for direction in ('', '-'):
+            indexed = queryset.order_by(
+                f'{direction}{column}', f'{direction}id'
+            )
+            computed = baselines[name].order_by(
+                f'{direction}value', f'{direction}id'
+            )
+            for offset in (0, args.titles // 2):
+                indexed_page = indexed[offset:offset + PAGE_SIZE]
+                computed_page = computed[offset:offset + PAGE_SIZE]
+                print(
+                    f'{direction + name:<16}{offset:>8}'
+                    f'{measure(lambda: list(indexed_page.all())):>14.2f}'
+                    f'{plan(indexed_page):>7}'
+                    f'{measure(lambda: list(computed_page.all())):>15.2f}'
+                    f'{plan(computed_page):>7}'
+                )
+
+
+if __name__ == '__main__':
+    main()
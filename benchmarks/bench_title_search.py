@@ -0,0 +1,46 @@
+"""Сравнение поиска по FTS5 с фильтром `name__icontains`.
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.bench_title_search --titles 1000000
+"""
+import argparse
+
+from benchmarks.utils import WORDS, create_catalog, measure, setup_django
+
+QUERIES = (WORDS[10], WORDS[200][:4], WORDS[4000], f'{WORDS[1]} {WORDS[2]}')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--titles', type=int, default=1_000_000)
+    parser.add_argument('--db', default=None)
+    args = parser.parse_args()
+
+    setup_django(args.db)
+    from reviews.models import Title
+    from reviews.search import rebuild_title_search_index, search_titles
+
+    create_catalog(args.titles)
+    rebuild_title_search_index()
+    queryset = Title.objects.order_by('id')
+
+    def icontains_page(value):
+        titles = queryset.filter(name__icontains=value)
+        return titles.count(), list(titles[:10])
+
+    def search_page(value):
+        titles = search_titles(queryset, value)
+        return titles.count(), list(titles[:10])
+
+    print(f'{"query":<24}{"icontains, ms":>16}{"fts5, ms":>12}')
+    for value in QUERIES:
+        print(
+            f'{value:<24}'
+            f'{measure(lambda: icontains_page(value)):>16.2f}'
+            f'{measure(lambda: search_page(value)):>12.2f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""Подсказки по началу названия: индекс в памяти против запросов к базе.
+
+Для нескольких префиксов разной длины сравниваются
+`TitlePrefixIndex.suggest()`, диапазон по индексу `name_normalized` и
+`icontains`, который раньше использовался для поиска по мере ввода.
+
+Затем несколько потоков запрашивают подсказки дольше, чем
+TITLE_SUGGEST_CHECK_INTERVAL, пока раз в секунду каталог меняется в
+обход сигналов, как из другого процесса. Печатаются p50, p99 и максимум
+задержки: в них попадают проверки свежести и перестроения индекса.
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.bench_title_suggest --titles 1000000
+"""
+import argparse
+import statistics
+import threading
+import time
+
+from benchmarks.utils import WORDS, create_catalog, measure, setup_django
+
+LIMIT = 10
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--titles', type=int, default=1_000_000)
+    parser.add_argument('--db', default=None)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument(
+        '--duration', type=float, default=None,
+        help='секунд под нагрузкой, по умолчанию 3 интервала проверки'
+    )
+    args = parser.parse_args()
+
+    setup_django(args.db)
+    from django.conf import settings
+
+    from api.filters import PREFIX_UPPER_BOUND
+    from api.suggest import TitlePrefixIndex
+    from reviews.models import Title
+
+    create_catalog(args.titles)
+    index = TitlePrefixIndex()
+    started = time.perf_counter()
+    index.suggest('а', LIMIT)
+    print(
+        f'Индекс построен за {time.perf_counter() - started:.1f} с, '
+        f'{args.titles} произведений.'
+    )
+
+    print(
+        f'{"prefix":<12}{"memory, ms":>12}{"range, ms":>12}'
+        f'{"icontains, ms":>16}'
+    )
+    word = WORDS[len(WORDS) // 2]
+    for prefix in (word[:1], word[:3], word, f'{word} {WORDS[0][:2]}'):
+        titles = Title.objects.values_list('id', 'name')
+        in_range = titles.filter(
+            name_normalized__gte=prefix,
+            name_normalized__lt=prefix + PREFIX_UPPER_BOUND,
+        ).order_by('name_normalized', 'id')[:LIMIT]
+        contains = titles.filter(name__icontains=prefix)[:LIMIT]
+        print(
+            f'{prefix:<12}'
+            f'{measure(lambda: index.suggest(prefix, LIMIT), 1000):>12.4f}'
+            f'{measure(lambda: list(in_range.all())):>12.2f}'
+            f'{measure(lambda: list(contains.all())):>16.2f}'
+        )
+
+    duration = args.duration or 3 * settings.TITLE_SUGGEST_CHECK_INTERVAL
+    timings = measure_under_changes(index, word[:3], args.threads, duration)
+    percentiles = statistics.quantiles(timings, n=100)
+    print(
+        f'{args.threads} потоков, {duration:.0f} с, {len(timings)} запросов: '
+        f'p50 {percentiles[49]:.3f} мс, p99 {percentiles[98]:.3f} мс, '
+        f'максимум {max(timings):.1f} мс.'
+    )
+
+
+def measure_under_changes(index, prefix, threads, duration):
+    """Задержки подсказок в мс, пока каталог меняется в обход сигналов."""
+    from django.db import connection
+
+    from api.cache import bump_version
+    from reviews.models import Title
+    from reviews.search import normalize_name
+
+    timings = []
+    deadline = time.monotonic() + duration
+
+    def worker():
+        local = []
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            index.suggest(prefix, LIMIT)
+            local.append((time.perf_counter() - started) * 1000)
+        connection.close()
+        timings.extend(local)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    step = 0
+    while time.monotonic() < deadline:
+        step += 1
+        name = f'{prefix} {WORDS[step % len(WORDS)]}'
+        Title.objects.bulk_create([Title(
+            name=name, name_normalized=normalize_name(name), year=2000
+        )])
+        bump_version(Title)
+        time.sleep(1)
+    for thread in workers:
+        thread.join()
+    return timings
+
+
+if __name__ == '__main__':
+    main()
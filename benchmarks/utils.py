@@ -0,0 +1,133 @@
+import itertools
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+PROJECT_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'api_yamdb'
+)
+
+SYLLABLES = (
+    ('ка', 'ро', 'ми', 'ле', 'на', 'то', 'зё', 'вы', 'шу', 'да', 'ги', 'по'),
+    ('ba', 'ko', 're', 'ni', 'sa', 'lu', 'te', 'vo', 'mi', 'da', 'ge', 'ru'),
+)
+
+
+def build_vocabulary(size=5000, seed=0):
+    rnd = random.Random(seed)
+    words = set()
+    while len(words) < size:
+        syllables = rnd.choice(SYLLABLES)
+        words.add(''.join(
+            rnd.choice(syllables) for _ in range(rnd.randint(2, 4))
+        ))
+    return sorted(words)
+
+
+WORDS = build_vocabulary()
+
+
+def setup_django(db_name=None):
+    """Настраивает Django на отдельную базу и применяет миграции."""
+    sys.path.insert(0, PROJECT_DIR)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+    import django
+    from django.conf import settings
+    from django.core.management import call_command
+
+    if db_name is None:
+        db_name = os.path.join(tempfile.mkdtemp(), 'bench.sqlite3')
+    settings.DATABASES['default']['NAME'] = db_name
+    django.setup()
+    call_command('migrate', verbosity=0)
+    return db_name
+
+
+def random_name(rnd):
+    return ' '.join(
+        rnd.choice(WORDS).capitalize() if idx == 0 else rnd.choice(WORDS)
+        for idx in range(rnd.randint(1, 4))
+    )
+
+
+def create_catalog(titles, batch_size=10000, seed=0):
+    """Заполняет базу синтетическим каталогом произведений."""
+    from reviews.models import Category, Title
+
+    rnd = random.Random(seed)
+    category = Category.objects.create(name='Фильм', slug='films')
+    for start in range(0, titles, batch_size):
+        batch = [
+            Title(
+                name=random_name(rnd),
+                year=rnd.randint(1900, 2020),
+                description=random_name(rnd),
+                category=category,
+            )
+            for _ in range(min(batch_size, titles - start))
+        ]
+        for title in batch:
+            title.fill_normalized_fields()
+        Title.objects.bulk_create(batch)
+
+
+def create_reviews(max_per_title=8, users=50, batch_size=10000, seed=0):
+    """Раздаёт произведениям отзывы и пересчитывает рейтинги."""
+    from reviews.models import Review, Title, User
+    from reviews.ranking import rebuild_rankings
+
+    rnd = random.Random(seed)
+    User.objects.bulk_create(
+        User(username=f'critic{idx}', email=f'critic{idx}@yamdb.fake')
+        for idx in range(users)
+    )
+    user_ids = list(User.objects.values_list('id', flat=True))
+    rows = (
+        Review(
+            title_id=title_id, author_id=author_id, text='Отзыв',
+            score=rnd.randint(1, 10)
+        )
+        for title_id in Title.objects.values_list('id', flat=True).iterator()
+        for author_id in rnd.sample(user_ids, rnd.randint(0, max_per_title))
+    )
+    while batch := list(itertools.islice(rows, batch_size)):
+        Review.objects.bulk_create(batch)
+    Title.objects.all().rebuild_rating()
+    rebuild_rankings()
+
+
+def measure(func, repeat=5):
+    """Возвращает медианное время выполнения в миллисекундах."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def assign_genres(genres, per_title=(1, 4), batch_size=10000, seed=0):
+    """Создаёт жанры и раздаёт их уже созданным произведениям."""
+    from reviews.models import Genre, Title
+
+    rnd = random.Random(seed)
+    Genre.objects.bulk_create(
+        Genre(name=f'Жанр {idx}', slug=f'genre-{idx}')
+        for idx in range(genres)
+    )
+    genre_ids = list(Genre.objects.order_by('id').values_list('id', flat=True))
+    # Первые жанры популярнее остальных, как в настоящем каталоге.
+    weights = [1 / (idx + 1) for idx in range(genres)]
+    rows = (
+        Title.genre.through(title_id=title_id, genre_id=genre_id)
+        for title_id in Title.objects.values_list('id', flat=True).iterator()
+        for genre_id in set(rnd.choices(
+            genre_ids, weights, k=rnd.randint(*per_title)
+        ))
+    )
+    while batch := list(itertools.islice(rows, batch_size)):
+        Title.genre.through.objects.bulk_create(batch)
+    return genre_ids
@@ -0,0 +1,67 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Title
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def get_rating(self, client, title_id):
+        response = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.status_code == HTTPStatus.OK
+        return response.json().get('rating')
+
+    def test_01_rating_follows_reviews(self, client, admin_client,
+                                       user_client, moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+
+        create_single_review(user_client, title_id, 'user review', 3)
+        review = create_single_review(
+            moderator_client, title_id, 'moderator review', 8
+        ).json()
+        assert self.get_rating(client, title_id) == 5, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'создании отзыва.'
+        )
+
+        review_url = self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=title_id, review_id=review['id']
+        )
+        moderator_client.patch(review_url, data={'score': 10})
+        assert self.get_rating(client, title_id) == 6, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'изменении оценки в отзыве.'
+        )
+
+        moderator_client.delete(review_url)
+        assert self.get_rating(client, title_id) == 3, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'удалении отзыва.'
+        )
+        assert self.get_rating(client, titles[1]['id']) is None
+
+    def test_02_rebuild_ratings_command(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'user review', 7)
+        Title.objects.update(rating_sum=0, rating_count=0)
+
+        call_command('rebuild_ratings')
+
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating_sum, title.rating_count) == (7, 1), (
+            'Проверьте, что команда `rebuild_ratings` пересчитывает '
+            'рейтинг произведений по существующим отзывам.'
+        )
@@ -0,0 +1,85 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Comment, Genre, Review, Title
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200, (
+        f'Проверьте, что GET-запрос к `{url}` возвращает ответ со статусом '
+        '200.'
+    )
+    return len(context.captured_queries)
+
+
+def fill_catalog(django_user_model, size):
+    category = Category.objects.create(name='Фильм', slug='films')
+    genres = [
+        Genre.objects.create(name=f'Жанр {idx}', slug=f'genre-{idx}')
+        for idx in range(3)
+    ]
+    authors = [
+        django_user_model.objects.create_user(
+            username=f'author-{idx}', email=f'author-{idx}@yamdb.fake'
+        )
+        for idx in range(size)
+    ]
+    titles = []
+    for idx in range(size):
+        title = Title.objects.create(
+            name=f'Произведение {idx}', year=2000, category=category
+        )
+        title.genre.set(genres)
+        titles.append(title)
+    reviews = [
+        Review.objects.create(
+            title=titles[0], author=author, text='text', score=5
+        )
+        for author in authors
+    ]
+    for author in authors:
+        Comment.objects.create(review=reviews[0], author=author, text='text')
+    return titles[0], reviews[0]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09QueryCount:
+
+    ENDPOINTS = (
+        ('/api/v1/titles/', 3),
+        ('/api/v1/categories/', 2),
+        ('/api/v1/genres/', 2),
+        ('/api/v1/titles/{title_id}/', 3),
+        ('/api/v1/titles/{title_id}/reviews/', 3),
+        ('/api/v1/titles/{title_id}/reviews/{review_id}/comments/', 3),
+    )
+
+    def check_budget(self, client, django_user_model, size):
+        title, review = fill_catalog(django_user_model, size)
+        for url_template, budget in self.ENDPOINTS:
+            url = url_template.format(title_id=title.id, review_id=review.id)
+            queries = count_queries(client, url)
+            assert queries <= budget, (
+                f'Проверьте, что GET-запрос к `{url}` выполняет не более '
+                f'{budget} запросов к базе данных. Сейчас: {queries}.'
+            )
+
+    def test_01_small_page(self, client, django_user_model):
+        self.check_budget(client, django_user_model, 1)
+
+    def test_02_full_page(self, client, django_user_model):
+        self.check_budget(client, django_user_model, 10)
+
+    def test_03_users_list(self, admin_client, django_user_model):
+        for idx in range(10):
+            django_user_model.objects.create_user(
+                username=f'user-{idx}', email=f'user-{idx}@yamdb.fake'
+            )
+        queries = count_queries(admin_client, '/api/v1/users/')
+        assert queries <= 3, (
+            'Проверьте, что GET-запрос к `/api/v1/users/` выполняет не более '
+            f'3 запросов к базе данных. Сейчас: {queries}.'
+        )
@@ -0,0 +1,63 @@
+import pytest
+
+from reviews.models import Comment, Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10CursorPagination:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def walk(self, client, url):
+        ids = []
+        while url:
+            response = client.get(url)
+            assert response.status_code == 200
+            data = response.json()
+            assert 'count' not in data, (
+                'Проверьте, что в курсорном режиме пагинации не считается '
+                'общее количество объектов.'
+            )
+            ids.extend(item['id'] for item in data['results'])
+            url = data['next']
+        return ids
+
+    def test_01_cursor_walks_all_pages(self, client, django_user_model):
+        title = Title.objects.create(name='Произведение', year=2000)
+        authors = [
+            django_user_model.objects.create_user(
+                username=f'author-{idx}', email=f'author-{idx}@yamdb.fake'
+            )
+            for idx in range(25)
+        ]
+        reviews = [
+            Review.objects.create(
+                title=title, author=author, text='text', score=5
+            )
+            for author in authors
+        ]
+        for author in authors:
+            Comment.objects.create(
+                review=reviews[0], author=author, text='text'
+            )
+
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        assert self.walk(client, reviews_url + '?cursor=') == [
+            review.id for review in reviews
+        ], (
+            f'Проверьте, что курсорная пагинация `{reviews_url}` '
+            'возвращает все отзывы в порядке публикации.'
+        )
+        comments_url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=title.id, review_id=reviews[0].id
+        )
+        assert len(self.walk(client, comments_url + '?cursor=')) == 25
+
+        response = client.get(reviews_url)
+        assert response.json()['count'] == 25, (
+            'Проверьте, что без параметра `cursor` сохраняется постраничная '
+            'пагинация с ключом `count`.'
+        )
@@ -0,0 +1,51 @@
+import pytest
+
+from reviews.models import Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11TitleSearch:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def search(self, client, value):
+        response = client.get(self.TITLES_URL, {'search': value})
+        assert response.status_code == 200
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_search_folds_case_and_yo(self, client):
+        Title.objects.create(name='Ёжик в тумане', year=1975)
+        Title.objects.create(name='Терминатор', year=1984)
+
+        assert self.search(client, 'терминатор') == ['Терминатор'], (
+            'Проверьте, что параметр `search` ищет произведения без учёта '
+            'регистра кириллицы.'
+        )
+        assert self.search(client, 'ежик') == ['Ёжик в тумане'], (
+            'Проверьте, что параметр `search` не различает буквы `е` и `ё`.'
+        )
+        assert self.search(client, 'терм') == ['Терминатор'], (
+            'Проверьте, что параметр `search` находит произведения по '
+            'началу слова.'
+        )
+
+    def test_02_search_orders_by_relevance_and_tracks_changes(self, client):
+        Title.objects.create(
+            name='Дом', year=2000, description='Про море и море'
+        )
+        sea = Title.objects.create(
+            name='Море', year=2000, description='Море, море, море'
+        )
+        assert self.search(client, 'море') == ['Море', 'Дом'], (
+            'Проверьте, что результаты поиска упорядочены по релевантности.'
+        )
+
+        sea.name = 'Океан'
+        sea.description = ''
+        sea.save()
+        assert self.search(client, 'океан') == ['Океан']
+        sea.delete()
+        assert self.search(client, 'океан') == [], (
+            'Проверьте, что индекс поиска обновляется при изменении и '
+            'удалении произведений.'
+        )
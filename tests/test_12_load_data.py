@@ -0,0 +1,86 @@
+import csv
+import os
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Comment, Genre, Review, Title, User
+from tests.conftest import MANAGE_PATH
+
+DATA_PATH = os.path.join(MANAGE_PATH, 'static', 'data')
+
+
+def count_rows(filename):
+    with open(os.path.join(DATA_PATH, filename), encoding='utf-8') as file:
+        return sum(1 for _ in csv.DictReader(file))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12LoadData:
+
+    def test_01_load_data(self):
+        call_command('load_data', batch_size=7, stdout=StringIO())
+
+        for model, filename in (
+            (User, 'users.csv'),
+            (Title, 'titles.csv'),
+            (Review, 'review.csv'),
+            (Comment, 'comments.csv'),
+            (Title.genre.through, 'genre_title.csv'),
+        ):
+            assert model.objects.count() == count_rows(filename), (
+                'Проверьте, что команда `load_data` загружает все строки '
+                f'файла `{filename}`.'
+            )
+        assert not Title.objects.filter(name_normalized='').exists(), (
+            'Проверьте, что команда `load_data` заполняет нормализованные '
+            'названия произведений.'
+        )
+        assert Title.objects.filter(rating_count__gt=0).exists(), (
+            'Проверьте, что после загрузки отзывов команда `load_data` '
+            'пересчитывает рейтинг произведений.'
+        )
+
+    def test_02_skipped_rows_reported(self, tmp_path, settings):
+        data_path = tmp_path / 'static' / 'data'
+        data_path.mkdir(parents=True)
+        for filename, content in (
+            ('category.csv', 'id,name,slug\n1,Фильм,movie\n'),
+            ('genre.csv', 'id,name,slug\n1,Драма,drama\n2,Комедия,comedy\n'),
+            ('titles.csv', (
+                'id,name,year,category\n'
+                '1,Побег из Шоушенка,1994,1\n'
+                '2,Крестный отец,1972,9\n'
+            )),
+            ('genre_title.csv', (
+                'id,title_id,genre_id\n'
+                '1,1,1\n2,1,2\n3,1,1\n4,7,1\n5,1,5\n6,1,2\n'
+            )),
+        ):
+            (data_path / filename).write_text(content, encoding='utf-8')
+        settings.BASE_DIR = tmp_path
+        stdout = StringIO()
+        call_command('load_data', batch_size=2, stdout=stdout)
+        output = stdout.getvalue()
+
+        assert 'Пропущены строки с несуществующими category_id: 9' in (
+            output
+        ), (
+            'Проверьте, что команда `load_data` сообщает о строках со '
+            'ссылками на несуществующие записи.'
+        )
+        assert 'Пропущены строки с несуществующими title_id: 7' in output
+        assert 'Пропущены строки с несуществующими genre_id: 5' in output
+        assert (
+            'Пропущены повторяющиеся строки (title_id, genre_id): '
+            '(1, 1), (1, 2)'
+        ) in output, (
+            'Проверьте, что команда `load_data` пропускает повторяющиеся '
+            'пары произведение — жанр и сообщает о них.'
+        )
+        assert list(Title.objects.values_list('id', flat=True)) == [1]
+        assert set(Title.genre.through.objects.values_list(
+            'title_id', 'genre_id'
+        )) == {(1, 1), (1, 2)}
+        assert Genre.objects.count() == 2
@@ -0,0 +1,86 @@
+from io import StringIO
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+
+from reviews.models import EmailOutbox
+
+
+class RejectingEmailBackend(EmailBackend):
+    """Почтовый бэкенд, который не принимает адреса на bad@."""
+
+    def send_messages(self, messages):
+        for message in messages:
+            if any(address.startswith('bad@') for address in message.to):
+                raise ConnectionRefusedError(f'Адрес отклонён: {message.to}')
+        return super().send_messages(messages)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13EmailOutbox:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+
+    def test_01_signup_queues_and_coalesces_emails(self, client, settings):
+        settings.EMAIL_OUTBOX_ENABLED = True
+        valid_data = {
+            'email': 'valid@yamdb.fake',
+            'username': 'valid_username'
+        }
+        outbox_before_count = len(mail.outbox)
+
+        for _ in range(3):
+            response = client.post(self.URL_SIGNUP, data=valid_data)
+            assert response.status_code == 200
+        assert len(mail.outbox) == outbox_before_count, (
+            'Проверьте, что при включённой очереди писем регистрация не '
+            'отправляет письмо внутри запроса.'
+        )
+        assert EmailOutbox.objects.count() == 1, (
+            'Проверьте, что повторные регистрации с одним email '
+            'объединяются в одно письмо в очереди.'
+        )
+
+        call_command('send_outbox_emails', stdout=StringIO())
+        assert len(mail.outbox) == outbox_before_count + 1, (
+            'Проверьте, что команда `send_outbox_emails` отправляет письма '
+            'из очереди.'
+        )
+        assert valid_data['email'] in mail.outbox[-1].to
+        assert not EmailOutbox.objects.exists(), (
+            'Проверьте, что отправленные письма удаляются из очереди.'
+        )
+
+    def test_02_failed_email_does_not_block_queue(self, settings):
+        settings.EMAIL_BACKEND = (
+            'tests.test_13_email_outbox.RejectingEmailBackend'
+        )
+        settings.EMAIL_OUTBOX_MAX_ATTEMPTS = 2
+        for recipient in ('a@yamdb.fake', 'bad@yamdb.fake', 'c@yamdb.fake'):
+            EmailOutbox.objects.create(
+                recipient=recipient, subject='Тема', message='Текст'
+            )
+        outbox_before_count = len(mail.outbox)
+
+        call_command('send_outbox_emails', stdout=StringIO())
+        assert sorted(
+            email.to[0] for email in mail.outbox[outbox_before_count:]
+        ) == ['a@yamdb.fake', 'c@yamdb.fake'], (
+            'Проверьте, что письмо, которое не удалось отправить, не мешает '
+            'отправке остальных писем из очереди.'
+        )
+        failed = EmailOutbox.objects.get()
+        assert failed.recipient == 'bad@yamdb.fake'
+        assert failed.attempts == 1 and 'отклонён' in failed.last_error
+
+        for _ in range(3):
+            call_command('send_outbox_emails', stdout=StringIO())
+        assert len(mail.outbox) == outbox_before_count + 2, (
+            'Проверьте, что отправленные письма не отправляются повторно.'
+        )
+        assert EmailOutbox.objects.get().attempts == 2, (
+            'Проверьте, что после EMAIL_OUTBOX_MAX_ATTEMPTS попыток письмо '
+            'больше не отправляется.'
+        )
@@ -0,0 +1,68 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from api.authentication import RoleAccessToken
+
+
+def token_client(user):
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f'Bearer {RoleAccessToken.for_user(user)}'
+    )
+    return client
+
+
+def user_queries(context):
+    return [
+        query['sql'] for query in context.captured_queries
+        if 'FROM "reviews_user"' in query['sql']
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14StatelessAuth:
+
+    CATEGORIES_URL = '/api/v1/categories/'
+    USERS_URL = '/api/v1/users/'
+
+    def test_01_token_contains_role_claims(self, user):
+        token = RoleAccessToken.for_user(user)
+        for claim in ('role', 'is_staff', 'is_superuser', 'token_version'):
+            assert claim in token.payload, (
+                f'Проверьте, что токен доступа содержит поле `{claim}`.'
+            )
+
+    def test_02_permissions_without_user_lookup(self, admin):
+        client = token_client(admin)
+        client.get(self.CATEGORIES_URL)
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(
+                self.CATEGORIES_URL, data={'name': 'Фильм', 'slug': 'films'}
+            )
+        assert response.status_code == 201
+        assert not user_queries(context), (
+            'Проверьте, что токен с ролью пользователя проверяется без '
+            'запроса пользователя из базы данных.'
+        )
+
+    def test_03_role_change_revokes_tokens(self, admin_client, moderator):
+        client = token_client(moderator)
+        response = client.get(f'{self.USERS_URL}me/')
+        assert response.status_code == 200
+        assert response.json()['role'] == 'moderator'
+
+        response = admin_client.patch(
+            f'{self.USERS_URL}{moderator.username}/', data={'role': 'user'}
+        )
+        assert response.status_code == 200
+        response = client.get(f'{self.USERS_URL}me/')
+        assert response.status_code == 401, (
+            'Проверьте, что после смены роли пользователя ранее выданные '
+            'токены перестают действовать.'
+        )
+
+        moderator.refresh_from_db()
+        response = token_client(moderator).get(f'{self.USERS_URL}me/')
+        assert response.json()['role'] == 'user'
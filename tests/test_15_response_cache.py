@@ -0,0 +1,58 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15ResponseCache:
+
+    CATEGORIES_URL = '/api/v1/categories/'
+    GENRES_URL = '/api/v1/genres/'
+    STATS_URL = '/api/v1/cache-stats/'
+
+    def test_01_list_served_from_cache(self, client):
+        Category.objects.create(name='Фильм', slug='films')
+        first = client.get(self.CATEGORIES_URL)
+        assert first['X-Cache'] == 'MISS'
+
+        with CaptureQueriesContext(connection) as context:
+            second = client.get(self.CATEGORIES_URL)
+        assert second['X-Cache'] == 'HIT'
+        assert second.json() == first.json()
+        assert not context.captured_queries, (
+            f'Проверьте, что повторный GET-запрос к `{self.CATEGORIES_URL}` '
+            'отдаётся из кеша без запросов к базе данных.'
+        )
+        assert client.get(
+            self.CATEGORIES_URL, {'search': 'Фильм'}
+        )['X-Cache'] == 'MISS', (
+            'Проверьте, что ключ кеша учитывает параметры запроса.'
+        )
+
+    def test_02_create_and_delete_invalidate_cache(self, admin_client):
+        admin_client.get(self.GENRES_URL)
+        admin_client.post(
+            self.GENRES_URL, data={'name': 'Драма', 'slug': 'drama'}
+        )
+        response = admin_client.get(self.GENRES_URL)
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['count'] == 1, (
+            'Проверьте, что создание жанра сбрасывает кеш списка жанров.'
+        )
+
+        admin_client.delete(f'{self.GENRES_URL}drama/')
+        assert admin_client.get(self.GENRES_URL).json()['count'] == 0, (
+            'Проверьте, что удаление жанра сбрасывает кеш списка жанров.'
+        )
+
+    def test_03_stats(self, client, admin_client, user_client):
+        client.get(self.CATEGORIES_URL)
+        client.get(self.CATEGORIES_URL)
+        assert user_client.get(self.STATS_URL).status_code == 403
+        response = admin_client.get(self.STATS_URL)
+        assert response.status_code == 200
+        assert response.json()['reviews.category'] == {
+            'hits': 1, 'misses': 1
+        }
@@ -0,0 +1,105 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Review, Title
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16ConditionalGet:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def check_not_modified(self, client, url):
+        response = client.get(url)
+        assert response.status_code == 200
+        etag = response.get('ETag')
+        assert etag, (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит ETag.'
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304, (
+            f'Проверьте, что GET-запрос к `{url}` с актуальным '
+            '`If-None-Match` возвращает ответ со статусом 304.'
+        )
+        assert len(context.captured_queries) <= 1, (
+            f'Проверьте, что для ответа 304 на `{url}` не выполняется '
+            'основной запрос к базе данных.'
+        )
+        return etag
+
+    def test_01_etags_change_with_data(self, client, admin_client, admin,
+                                       user, user_client):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        title_id = titles[0]['id']
+        review_id = reviews[0]['id']
+        title_url = self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(title_id=title_id)
+        comments_url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=title_id, review_id=review_id
+        )
+
+        title_etag = self.check_not_modified(client, title_url)
+        reviews_etag = self.check_not_modified(client, reviews_url)
+        comments_etag = self.check_not_modified(client, comments_url)
+
+        user_client.post(reviews_url, data={'text': 'text', 'score': 1})
+        assert client.get(
+            title_url, HTTP_IF_NONE_MATCH=title_etag
+        ).status_code == 200, (
+            'Проверьте, что ETag произведения меняется после нового отзыва.'
+        )
+        assert client.get(
+            reviews_url, HTTP_IF_NONE_MATCH=reviews_etag
+        ).status_code == 200
+
+        user_client.post(comments_url, data={'text': 'text'})
+        assert client.get(
+            comments_url, HTTP_IF_NONE_MATCH=comments_etag
+        ).status_code == 200, (
+            'Проверьте, что ETag списка комментариев меняется после нового '
+            'комментария.'
+        )
+
+    def test_02_missing_title(self, client):
+        response = client.get(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=404),
+            HTTP_IF_NONE_MATCH='"anything"'
+        )
+        assert response.status_code == 404
+
+    @pytest.mark.parametrize('title_id', ['abc', '1.5'])
+    def test_03_invalid_title_pk(self, client, title_id):
+        response = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.status_code == 404, (
+            'Проверьте, что запрос произведения с нечисловым id '
+            'возвращает 404.'
+        )
+
+    def test_04_rebuild_ratings_changes_etag(self, client, admin):
+        title = Title.objects.create(name='Произведение', year=2000)
+        url = self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title.pk)
+        etag = self.check_not_modified(client, url)
+        Review.objects.bulk_create([
+            Review(title=title, author=admin, text='Отзыв', score=9)
+        ])
+        call_command('rebuild_ratings', stdout=StringIO())
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что пересчёт рейтингов меняет ETag произведения.'
+        )
+        assert response.json()['rating'] == 9
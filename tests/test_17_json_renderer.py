@@ -0,0 +1,90 @@
+import datetime
+import decimal
+import uuid
+from collections import OrderedDict
+from io import BytesIO
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ErrorDetail
+from rest_framework.renderers import JSONRenderer
+
+from api.parsers import FastJSONParser
+from api.renderers import FastJSONRenderer
+from tests.utils import create_reviews
+
+PAYLOADS = (
+    None,
+    [],
+    OrderedDict([
+        ('count', 1), ('next', None), ('rating', 7.5),
+        ('name', 'Крёстный отец\u2028\u2029"\\'), ('ok', True),
+    ]),
+    {'name': [ErrorDetail('Обязательное поле.', code='required')]},
+    {1: 'int key', 'lazy': gettext_lazy('Not found.')},
+    {
+        'date': datetime.datetime(2020, 1, 13, 23, 20, 2, 422000,
+                                  tzinfo=datetime.timezone.utc),
+        'day': datetime.date(2020, 1, 13),
+        'price': decimal.Decimal('1.10'),
+        'uuid': uuid.UUID(int=1),
+    },
+    {'rating': 1e16, 'scores': [1e-5, 0.0001, -2.5e-7, 1.5e300, 0.0]},
+    {'price': decimal.Decimal('1e20')},
+)
+
+
+class Test17JSONRenderer:
+
+    @pytest.mark.parametrize('data', PAYLOADS)
+    def test_01_byte_identical(self, data):
+        assert FastJSONRenderer().render(data) == JSONRenderer().render(
+            data
+        ), 'Проверьте, что FastJSONRenderer совпадает с JSONRenderer.'
+
+    @pytest.mark.parametrize('value', (
+        float('nan'), float('inf'), float('-inf')
+    ))
+    def test_02_non_finite_floats(self, value):
+        data = {'results': [{'rating': value}]}
+        with pytest.raises(ValueError):
+            JSONRenderer().render(data)
+        with pytest.raises(ValueError):
+            FastJSONRenderer().render(data)
+
+        class LenientRenderer(JSONRenderer):
+            strict = False
+
+        class LenientFastRenderer(FastJSONRenderer):
+            strict = False
+
+        assert LenientFastRenderer().render(data) == LenientRenderer().render(
+            data
+        ), 'Проверьте, что при STRICT_JSON=False NaN записывается как в DRF.'
+
+    def test_03_indent_falls_back(self):
+        data = {'name': 'Фильм'}
+        assert FastJSONRenderer().render(
+            data, 'application/json; indent=4'
+        ) == JSONRenderer().render(data, 'application/json; indent=4')
+
+    def test_04_parser_round_trip(self):
+        data = {'text': 'Отзыв\u2028', 'score': 10}
+        stream = BytesIO(FastJSONRenderer().render(data))
+        assert FastJSONParser().parse(stream) == data
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_api_responses(self, client, admin_client, admin):
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        for url in (
+            '/api/v1/titles/',
+            f'/api/v1/titles/{titles[0]["id"]}/',
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/',
+        ):
+            response = client.get(url)
+            assert response.content == JSONRenderer().render(
+                response.data
+            ), (
+                f'Проверьте, что ответ на GET-запрос к `{url}` совпадает с '
+                'выводом стандартного JSONRenderer.'
+            )
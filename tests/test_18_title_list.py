@@ -0,0 +1,69 @@
+import json
+
+import pytest
+
+from api.serializers import TitleGetSerializer
+from reviews.models import Genre, Title
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18TitleList:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_list_matches_serializer(self, client, admin_client, admin,
+                                        user, user_client):
+        create_reviews(admin_client, {admin: admin_client, user: user_client})
+        Title.objects.create(name='Без категории', year=2000)
+
+        results = client.get(self.TITLES_URL).json()['results']
+        expected = TitleGetSerializer(
+            Title.objects.order_by('id'), many=True
+        ).data
+        assert len(results) == len(expected)
+        for title, expected_title in zip(results, expected):
+            assert list(title) == list(expected_title), (
+                f'Проверьте, что элементы списка `{self.TITLES_URL}` содержат '
+                'те же поля, что и TitleGetSerializer.'
+            )
+            for field in ('id', 'name', 'year', 'rating', 'description',
+                          'category'):
+                assert title[field] == expected_title[field]
+            assert sorted(
+                title['genre'], key=lambda genre: genre['slug']
+            ) == sorted(
+                map(dict, expected_title['genre']),
+                key=lambda genre: genre['slug']
+            )
+
+    def test_02_genre_order_matches_detail(self, client, admin_client):
+        genres = [
+            Genre.objects.create(name=f'Жанр {idx}', slug=f'genre-{idx}')
+            for idx in range(4)
+        ]
+        title = Title.objects.create(name='Произведение', year=2000)
+        # Строки промежуточной таблицы создаются не в порядке id жанров.
+        for idx in (2, 0, 3, 1):
+            title.genre.add(genres[idx])
+        expected = [
+            {'name': genre.name, 'slug': genre.slug} for genre in genres
+        ]
+        list_genres = client.get(self.TITLES_URL).json()['results'][0][
+            'genre'
+        ]
+        detail_genres = client.get(f'{self.TITLES_URL}{title.pk}/').json()[
+            'genre'
+        ]
+        assert list_genres == detail_genres == expected, (
+            'Проверьте, что жанры произведения в списке и на детальной '
+            'странице идут в одном порядке — по id жанра.'
+        )
+        response = admin_client.patch(
+            f'{self.TITLES_URL}{title.pk}/',
+            json.dumps({'genre': ['genre-3', 'genre-1']}),
+            content_type='application/json'
+        )
+        assert [genre['slug'] for genre in response.json()['genre']] == [
+            'genre-1', 'genre-3'
+        ]
@@ -0,0 +1,59 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19PaginationCount:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.fixture
+    def titles(self):
+        for idx in range(15):
+            Title.objects.create(name=f'Произведение {idx}', year=2000)
+
+    def count_queries(self, client, params):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(self.TITLES_URL, params)
+        assert response.status_code == 200
+        return response.json(), [
+            query['sql'] for query in context.captured_queries
+            if 'COUNT(' in query['sql']
+        ]
+
+    def test_01_exact_count_by_default(self, client, titles):
+        data, count_queries = self.count_queries(client, {})
+        assert data['count'] == 15
+        assert len(count_queries) == 1
+
+    def test_02_skip_count(self, client, titles):
+        data, count_queries = self.count_queries(client, {'count': 'false'})
+        assert 'count' not in data and not count_queries, (
+            'Проверьте, что при `count=false` количество объектов не '
+            'считается и не возвращается.'
+        )
+        assert len(data['results']) == 10
+        assert data['next'] and data['previous'] is None
+
+        data, _ = self.count_queries(client, {'count': 'false', 'page': 2})
+        assert len(data['results']) == 5
+        assert data['next'] is None and data['previous']
+        response = client.get(self.TITLES_URL, {'count': 'false', 'page': 3})
+        assert response.status_code == 404
+
+    def test_03_estimated_count_is_cached(self, client, titles):
+        data, count_queries = self.count_queries(
+            client, {'count': 'estimate'}
+        )
+        assert data['count'] == 15 and len(count_queries) == 1
+        Title.objects.create(name='Новое', year=2000)
+        data, count_queries = self.count_queries(
+            client, {'count': 'estimate'}
+        )
+        assert data['count'] == 15 and not count_queries, (
+            'Проверьте, что при `count=estimate` количество объектов '
+            'берётся из кеша.'
+        )
@@ -0,0 +1,144 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20SparseFields:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def get(self, client, url, params):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, params)
+        assert response.status_code == 200
+        return response.json(), [
+            query['sql'] for query in context.captured_queries
+        ]
+
+    def test_01_title_list_fields(self, client, admin_client, admin,
+                                  user, user_client):
+        create_comments(admin_client, {admin: admin_client, user: user_client})
+        data, queries = self.get(
+            client, self.TITLES_URL, {'fields': 'name,rating'}
+        )
+        assert [list(title) for title in data['results']] == [
+            ['name', 'rating'], ['name', 'rating']
+        ], (
+            f'Проверьте, что `{self.TITLES_URL}?fields=` возвращает только '
+            'перечисленные поля в порядке полей сериализатора.'
+        )
+        assert data['results'][0]['rating'] == 5
+        assert not any('genre' in sql for sql in queries), (
+            'Проверьте, что жанры не запрашиваются, если поле `genre` '
+            'не выбрано.'
+        )
+        assert not any('"description"' in sql for sql in queries)
+
+    def test_02_title_omit(self, client, admin_client):
+        create_comments(admin_client, {})
+        data, queries = self.get(
+            client, self.TITLES_URL, {'omit': 'description,genre,category'}
+        )
+        assert list(data['results'][0]) == ['id', 'name', 'year', 'rating']
+        assert not any('category' in sql for sql in queries)
+
+    def test_03_title_detail(self, client, admin_client):
+        _, _, titles = create_comments(admin_client, {})
+        url = f'{self.TITLES_URL}{titles[0]["id"]}/'
+        data, queries = self.get(client, url, {'fields': 'id,genre'})
+        assert list(data) == ['id', 'genre']
+        assert len(data['genre']) == 2
+        assert not any('"description"' in sql for sql in queries)
+
+        full = client.get(url).json()
+        assert 'description' in full and 'category' in full
+
+    def test_04_reviews_and_comments(self, client, admin_client, admin,
+                                     user, user_client):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        reviews_url = f'{self.TITLES_URL}{titles[0]["id"]}/reviews/'
+        data, queries = self.get(
+            client, reviews_url, {'fields': 'author,score'}
+        )
+        assert data['results'] == [
+            {'author': review['author'], 'score': review['score']}
+            for review in reviews
+        ]
+        data, queries = self.get(client, reviews_url, {'fields': 'id,text'})
+        assert list(data['results'][0]) == ['id', 'text']
+        assert not any('users_user' in sql for sql in queries), (
+            'Проверьте, что автор не подгружается, если поле `author` '
+            'не выбрано.'
+        )
+
+        data, _ = self.get(
+            client, reviews_url, {'fields': 'text', 'cursor': ''}
+        )
+        assert [review['text'] for review in data['results']] == [
+            review['text'] for review in reviews
+        ]
+
+        comments_url = f'{reviews_url}{reviews[0]["id"]}/comments/'
+        data, _ = self.get(client, comments_url, {'omit': 'pub_date,id'})
+        assert data['results'] == [
+            {'text': comment['text'], 'author': comment['author']}
+            for comment in comments
+        ]
+
+    def test_05_users(self, admin_client, admin, user_client, user):
+        data, _ = self.get(
+            admin_client, '/api/v1/users/', {'fields': 'username,role'}
+        )
+        assert {'username': user.username, 'role': user.role} in (
+            data['results']
+        )
+        data, _ = self.get(user_client, '/api/v1/users/me/', {'omit': 'bio'})
+        assert 'bio' not in data and data['username'] == user.username
+
+    def test_06_writes_ignore_fields(self, admin_client):
+        admin_client.post(
+            '/api/v1/categories/', data={'name': 'Фильм', 'slug': 'films'}
+        )
+        admin_client.post(
+            '/api/v1/genres/', data={'name': 'Драма', 'slug': 'drama'}
+        )
+        response = admin_client.post(
+            f'{self.TITLES_URL}?fields=name',
+            data={'name': 'Фильм', 'year': 2000, 'genre': ['drama'],
+                  'category': 'films'}
+        )
+        assert response.status_code == 201
+        assert 'category' in response.json(), (
+            'Проверьте, что `fields` влияет только на GET-запросы.'
+        )
+
+    @pytest.mark.parametrize('params', [
+        {'fields': 'name,unknown'},
+        {'omit': 'unknown'},
+        {'fields': 'name', 'omit': 'name'},
+    ])
+    def test_07_invalid_fields(self, params, admin_client, admin,
+                               user, user_client):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        reviews_url = f'{self.TITLES_URL}{titles[0]["id"]}/reviews/'
+        urls = (
+            self.TITLES_URL,
+            f'{self.TITLES_URL}{titles[0]["id"]}/',
+            reviews_url,
+            f'{reviews_url}{reviews[0]["id"]}/comments/',
+            '/api/v1/users/',
+        )
+        for url in urls:
+            response = admin_client.get(url, params)
+            assert response.status_code == 400, (
+                f'Проверьте, что `{url}` отвечает 400, если в `fields` или '
+                '`omit` есть неизвестное поле или не осталось ни одного поля.'
+            )
+            assert set(response.json()) & {'fields', 'omit'}
@@ -0,0 +1,83 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Review, Title
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21TitleExpand:
+
+    EXPAND = 'reviews,comments_count,score_histogram'
+
+    @pytest.fixture
+    def title_url(self, admin_client, admin, user, user_client):
+        _, _, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        return f'/api/v1/titles/{titles[0]["id"]}/'
+
+    def test_01_expand(self, client, title_url):
+        response = client.get(title_url, {'expand': self.EXPAND})
+        assert response.status_code == 200
+        data = response.json()
+        assert data['name'] and data['genre'], (
+            'Проверьте, что `?expand=` дополняет, а не заменяет ответ.'
+        )
+        assert data['reviews']['next'] is None
+        reviews = data['reviews']['results']
+        assert [review['comments_count'] for review in reviews] == [2, 0]
+        assert set(reviews[0]) == {
+            'id', 'text', 'author', 'score', 'pub_date', 'comments_count'
+        }
+        assert data['score_histogram'] == {
+            str(score): 2 if score == 5 else 0 for score in range(1, 11)
+        }
+
+    def test_02_without_expand(self, client, title_url):
+        data = client.get(title_url).json()
+        assert not {'reviews', 'score_histogram'} & set(data)
+
+        data = client.get(title_url, {'expand': 'reviews'}).json()
+        assert 'comments_count' not in data['reviews']['results'][0]
+        assert 'score_histogram' not in data
+
+    def test_03_query_count(self, client, title_url, django_user_model):
+        title = Title.objects.get(pk=title_url.split('/')[-2])
+        for idx in range(12):
+            author = django_user_model.objects.create(
+                username=f'reviewer{idx}', email=f'reviewer{idx}@yamdb.fake'
+            )
+            Review.objects.create(
+                title=title, author=author, text='Текст', score=idx % 10 + 1
+            )
+        with CaptureQueriesContext(connection) as context:
+            data = client.get(title_url, {'expand': self.EXPAND}).json()
+        assert len(context.captured_queries) <= 5, (
+            'Проверьте, что `?expand=` выполняется за фиксированное число '
+            'запросов к базе.'
+        )
+        assert len(data['reviews']['results']) == 10
+        assert data['reviews']['next'].endswith(
+            f'{title_url}reviews/?page=2'
+        )
+        assert sum(data['score_histogram'].values()) == 14
+
+    def test_04_etag_follows_comments(self, client, user_client, title_url):
+        response = client.get(title_url, {'expand': 'comments_count'})
+        etag = response['ETag']
+        data = response.json()
+        review_id = data['reviews']['results'][1]['id']
+        user_client.post(
+            f'{title_url}reviews/{review_id}/comments/', data={'text': 'Да'}
+        )
+        response = client.get(
+            title_url, {'expand': 'comments_count'},
+            HTTP_IF_NONE_MATCH=etag
+        )
+        assert response.status_code == 200, (
+            'Проверьте, что новый комментарий меняет ETag произведения '
+            'с `?expand=comments_count`.'
+        )
+        assert response.json()['reviews']['results'][1]['comments_count'] == 1
@@ -0,0 +1,89 @@
+import json
+
+import pytest
+from django.test import override_settings
+
+from api.views import GenreViewSet
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22Batch:
+
+    BATCH_URL = '/api/v1/batch/'
+
+    def post(self, client, subrequests):
+        return client.post(
+            self.BATCH_URL, json.dumps(subrequests),
+            content_type='application/json'
+        )
+
+    def test_01_dispatch(self, admin_client, admin):
+        titles, categories, genres = create_titles(admin_client)
+        response = self.post(admin_client, [
+            {'url': '/api/v1/categories/'},
+            {'url': '/api/v1/genres/?search=' + genres[0]['name']},
+            {'url': f'/api/v1/titles/{titles[0]["id"]}/'},
+            {'method': 'GET', 'url': '/api/v1/users/me/'},
+        ])
+        assert response.status_code == 200
+        categories_response, genres_response, title, me = response.json()
+        assert categories_response['status'] == 200
+        assert categories_response['body']['count'] == len(categories)
+        assert genres_response['body']['results'] == [genres[0]]
+        assert title['body']['name'] == titles[0]['name']
+        assert title['headers']['ETag']
+        assert me['body']['username'] == admin.username, (
+            'Проверьте, что подзапросы выполняются от имени пользователя '
+            f'из запроса к `{self.BATCH_URL}`.'
+        )
+
+    def test_02_permissions_per_subrequest(self, client, admin_client):
+        create_titles(admin_client)
+        response = self.post(client, [
+            {'url': '/api/v1/users/me/'},
+            {'url': '/api/v1/titles/'},
+            {'url': '/api/v1/unknown/'},
+            {'url': self.BATCH_URL},
+            {'url': '/admin/'},
+        ])
+        assert response.status_code == 200
+        assert [item['status'] for item in response.json()] == [
+            401, 200, 404, 404, 404
+        ], (
+            f'Проверьте, что `{self.BATCH_URL}` выполняет только запросы к '
+            'API.'
+        )
+
+    def test_03_validation(self, client):
+        assert self.post(client, []).status_code == 400
+        assert self.post(
+            client, [{'url': '/api/v1/genres/', 'method': 'DELETE'}]
+        ).status_code == 400, (
+            f'Проверьте, что `{self.BATCH_URL}` принимает только GET.'
+        )
+        assert self.post(
+            client, [{'url': 'api/v1/genres/'}]
+        ).status_code == 400
+        with override_settings(BATCH_MAX_REQUESTS=2):
+            response = self.post(client, [{'url': '/api/v1/genres/'}] * 3)
+        assert response.status_code == 400
+        for body in (5, None, {'url': '/api/v1/genres/'}):
+            assert self.post(client, body).status_code == 400, (
+                f'Проверьте, что `{self.BATCH_URL}` отвечает 400, если тело '
+                'запроса не список.'
+            )
+
+    def test_04_failing_subrequest(self, client, monkeypatch):
+        def broken_list(*args, **kwargs):
+            raise RuntimeError('Сбой')
+
+        monkeypatch.setattr(GenreViewSet, 'list', broken_list)
+        response = self.post(client, [
+            {'url': '/api/v1/genres/'}, {'url': '/api/v1/categories/'}
+        ])
+        assert response.status_code == 200
+        assert [item['status'] for item in response.json()] == [500, 200], (
+            'Проверьте, что ошибка одного подзапроса не ломает ответ '
+            f'`{self.BATCH_URL}` целиком.'
+        )
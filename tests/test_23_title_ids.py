@@ -0,0 +1,70 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Genre, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23TitleIds:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.fixture
+    def titles(self):
+        category = Category.objects.create(name='Фильм', slug='film')
+        genre = Genre.objects.create(name='Драма', slug='drama')
+        titles = []
+        for idx in range(15):
+            title = Title.objects.create(
+                name=f'Произведение {idx}', year=2000, category=category
+            )
+            title.genre.add(genre)
+            titles.append(title)
+        return titles
+
+    def test_01_ids_keep_order(self, client, titles):
+        ids = [titles[12].pk, titles[3].pk, titles[7].pk, titles[3].pk,
+               titles[14].pk, titles[0].pk, titles[1].pk, titles[2].pk,
+               titles[4].pk, titles[5].pk, titles[6].pk, titles[8].pk]
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(
+                self.TITLES_URL, {'ids': ','.join(map(str, ids))}
+            )
+        assert response.status_code == 200
+        data = response.json()
+        assert [title['id'] for title in data['results']] == list(
+            dict.fromkeys(ids)
+        ), (
+            f'Проверьте, что `{self.TITLES_URL}?ids=` возвращает все '
+            'запрошенные произведения в порядке перечисления id.'
+        )
+        assert data['count'] == 11 and data['next'] is None
+        assert data['results'][0]['genre'] == [
+            {'name': 'Драма', 'slug': 'drama'}
+        ]
+        assert data['results'][0]['category']['slug'] == 'film'
+        assert len(context.captured_queries) <= 3
+
+    def test_02_unknown_ids_are_skipped(self, client, titles):
+        response = client.get(
+            self.TITLES_URL, {'ids': f'{titles[1].pk},100500'}
+        )
+        assert [title['id'] for title in response.json()['results']] == [
+            titles[1].pk
+        ]
+
+    def test_03_validation(self, client, titles):
+        for ids in ('1,abc', '1.5', f'{titles[0].pk}.5'):
+            response = client.get(self.TITLES_URL, {'ids': ids})
+            assert response.status_code == 400, (
+                f'Проверьте, что `{self.TITLES_URL}?ids=` принимает только '
+                'целые числа.'
+            )
+        response = client.get(
+            self.TITLES_URL, {'ids': ','.join(map(str, range(1, 102)))}
+        )
+        assert response.status_code == 400, (
+            f'Проверьте, что длина списка `{self.TITLES_URL}?ids=` '
+            'ограничена.'
+        )
@@ -0,0 +1,150 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.fuzzy import rebuild_title_trigrams
+from reviews.models import Category, Comment, Genre, Review, Title, User
+
+# Полный просмотр таблицы допустим только там, где он ожидаем: у списков
+# без фильтров и у фильтров `icontains`, которые индекс не ускорит. Такие
+# запросы упорядочены по id и ограничены LIMIT, поэтому читают таблицу
+# лишь до конца страницы.
+CASES = [
+    ('client', '/api/v1/titles/', {'reviews_title'}),
+    ('client', '/api/v1/titles/?year=1950', set()),
+    (
+        'client', '/api/v1/titles/?genre=genre-1',
+        {'reviews_title', 'reviews_genre'}
+    ),
+    (
+        'client', '/api/v1/titles/?category=category-1',
+        {'reviews_title', 'reviews_category'}
+    ),
+    ('client', '/api/v1/titles/?category=category-1&year=1950', set()),
+    ('client', '/api/v1/titles/?genre__in=genre-1,genre-2', set()),
+    ('client', '/api/v1/titles/?genre_all=genre-1,genre-8', set()),
+    ('client', '/api/v1/titles/?name=title-1', {'reviews_title'}),
+    ('client', '/api/v1/titles/?name_startswith=title-1', set()),
+    ('client', '/api/v1/titles/?ids={title},{other_title}', set()),
+    ('client', '/api/v1/titles/?search=title', set()),
+    ('client', '/api/v1/titles/?search=title&facets=genre,year', set()),
+    ('client', '/api/v1/titles/?fuzzy=titel-12', set()),
+    (
+        'client', '/api/v1/titles/?year=1950&facets=genre,category,year',
+        set()
+    ),
+    ('client', '/api/v1/titles/{title}/', set()),
+    (
+        'client',
+        '/api/v1/titles/{title}/?expand=reviews,comments_count,'
+        'score_histogram',
+        set()
+    ),
+    ('client', '/api/v1/titles/{title}/reviews/', set()),
+    ('client', '/api/v1/titles/{title}/reviews/?cursor=', set()),
+    ('client', '/api/v1/titles/{title}/reviews/{review}/', set()),
+    ('client', '/api/v1/titles/{title}/reviews/{review}/comments/', set()),
+    (
+        'client',
+        '/api/v1/titles/{title}/reviews/{review}/comments/?cursor=',
+        set()
+    ),
+    ('client', '/api/v1/categories/', {'reviews_category'}),
+    ('client', '/api/v1/genres/', {'reviews_genre'}),
+    ('admin_client', '/api/v1/users/', {'reviews_user'}),
+    ('admin_client', '/api/v1/users/{username}/', set()),
+    ('admin_client', '/api/v1/users/me/', set()),
+]
+
+
+def full_scans(sql):
+    """Таблицы, которые план запроса просматривает целиком."""
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}'.replace('%', '%%'))
+        details = [row[-1] for row in cursor.fetchall()]
+    return {
+        detail.split()[1] for detail in details
+        if detail.startswith('SCAN ') and 'VIRTUAL TABLE' not in detail
+        and 'CONSTANT ROW' not in detail
+    }
+
+
+@pytest.mark.skipif(
+    connection.vendor != 'sqlite', reason='Планы запросов SQLite'
+)
+@pytest.mark.django_db(transaction=True)
+class Test24QueryPlans:
+
+    @pytest.fixture
+    def dataset(self, admin):
+        """Данные, на которых планировщику выгоднее индексы, чем перебор."""
+        Category.objects.bulk_create(
+            Category(name=f'Категория {idx}', slug=f'category-{idx}')
+            for idx in range(5)
+        )
+        Genre.objects.bulk_create(
+            Genre(name=f'Жанр {idx}', slug=f'genre-{idx}')
+            for idx in range(20)
+        )
+        User.objects.bulk_create(
+            User(username=f'reader{idx}', email=f'reader{idx}@yamdb.fake')
+            for idx in range(20)
+        )
+        category_ids = list(Category.objects.values_list('id', flat=True))
+        genre_ids = list(Genre.objects.values_list('id', flat=True))
+        user_ids = list(User.objects.values_list('id', flat=True))
+        Title.objects.bulk_create(
+            Title(
+                name=f'title-{idx}',
+                year=1900 + idx % 100,
+                category_id=category_ids[idx % len(category_ids)]
+            )
+            for idx in range(1000)
+        )
+        title_ids = list(Title.objects.values_list('id', flat=True))
+        Title.genre.through.objects.bulk_create(
+            Title.genre.through(
+                title_id=title_id,
+                genre_id=genre_ids[(idx + shift) % len(genre_ids)]
+            )
+            for idx, title_id in enumerate(title_ids) for shift in (0, 7)
+        )
+        Review.objects.bulk_create(
+            Review(title_id=title_id, author_id=author_id, text='Отзыв',
+                   score=5)
+            for title_id in title_ids[:100] for author_id in user_ids[:5]
+        )
+        review_ids = list(Review.objects.values_list('id', flat=True))
+        Comment.objects.bulk_create(
+            Comment(review_id=review_id, author_id=user_ids[-1],
+                    text='Комментарий')
+            for review_id in review_ids for _ in range(3)
+        )
+        rebuild_title_trigrams()
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        return {
+            'title': title_ids[0],
+            'other_title': title_ids[1],
+            'review': Review.objects.filter(
+                title_id=title_ids[0]
+            ).values_list('id', flat=True).first(),
+            'username': 'reader1',
+        }
+
+    @pytest.mark.parametrize('client_name,url,allowed_scans', CASES)
+    def test_no_unexpected_full_scans(self, request, dataset, client_name,
+                                      url, allowed_scans):
+        client = request.getfixturevalue(client_name)
+        url = url.format(**dataset)
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == 200, url
+        for query in context.captured_queries:
+            if not query['sql'].startswith('SELECT'):
+                continue
+            scans = full_scans(query['sql']) - allowed_scans
+            assert not scans, (
+                f'Запрос `{url}` просматривает таблицы {sorted(scans)} '
+                f'целиком. Добавьте подходящий индекс:\n{query["sql"]}'
+            )
@@ -0,0 +1,59 @@
+import pytest
+
+from reviews.models import Category, Genre, Title
+from reviews.search import normalize_name
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25NormalizedNames:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_normalize_name(self):
+        assert normalize_name('  Ёжик   в\tТУМАНЕ ') == 'ежик в тумане'
+        title = Title.objects.create(name='Ёжик  в Тумане', year=1975)
+        assert title.name_normalized == 'ежик в тумане'
+        title.name = 'ЁЛКИ'
+        title.save(update_fields=['name'])
+        title.refresh_from_db()
+        assert title.name_normalized == 'елки', (
+            'Проверьте, что нормализованное название обновляется и при '
+            'сохранении с `update_fields`.'
+        )
+
+    def test_02_title_name_filters(self, client):
+        for name in ('Ёжик в тумане', 'Ежики', 'Сказка сказок'):
+            Title.objects.create(name=name, year=1975)
+
+        def names(params):
+            response = client.get(self.TITLES_URL, params)
+            assert response.status_code == 200
+            return {title['name'] for title in response.json()['results']}
+
+        assert names({'name': 'ЕЖИК'}) == {'Ёжик в тумане', 'Ежики'}, (
+            f'Проверьте, что фильтр `{self.TITLES_URL}?name=` не зависит '
+            'от регистра кириллицы и буквы ё.'
+        )
+        assert names({'name': 'СКАЗОК'}) == {'Сказка сказок'}
+        assert names({'name_startswith': 'ЁЖИК  В'}) == {'Ёжик в тумане'}
+        assert names({'name_startswith': 'сказк'}) == {'Сказка сказок'}
+        assert names({'name_startswith': 'казка'}) == set()
+
+    def test_03_search_filters(self, client, admin_client, django_user_model):
+        Category.objects.create(name='Книги', slug='books')
+        Genre.objects.create(name='Ёлочная сказка', slug='tale')
+        django_user_model.objects.create(
+            username='Фёдор', email='fedor@yamdb.fake'
+        )
+        response = client.get('/api/v1/categories/', {'search': 'КНИГ'})
+        assert [item['slug'] for item in response.json()['results']] == [
+            'books'
+        ]
+        response = client.get('/api/v1/genres/', {'search': 'елочная'})
+        assert [item['slug'] for item in response.json()['results']] == [
+            'tale'
+        ]
+        response = admin_client.get('/api/v1/users/', {'search': 'федор'})
+        assert [
+            item['username'] for item in response.json()['results']
+        ] == ['Фёдор']
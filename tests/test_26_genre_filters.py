@@ -0,0 +1,73 @@
+import pytest
+
+from reviews.models import Genre, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26GenreFilters:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.fixture
+    def titles(self):
+        genres = {
+            slug: Genre.objects.create(name=slug, slug=slug)
+            for slug in ('drama', 'comedy', 'horror', 'dramedy')
+        }
+        catalog = {
+            'Драма': ('drama',),
+            'Комедия': ('comedy',),
+            'Трагикомедия': ('drama', 'comedy'),
+            'Всё сразу': ('drama', 'comedy', 'horror'),
+            'Драмеди': ('dramedy',),
+        }
+        for name, slugs in catalog.items():
+            title = Title.objects.create(name=name, year=2000)
+            title.genre.set([genres[slug] for slug in slugs])
+
+    def names(self, client, params):
+        response = client.get(self.TITLES_URL, params)
+        assert response.status_code == 200
+        results = response.json()['results']
+        names = [title['name'] for title in results]
+        assert len(names) == len(set(names)), (
+            'Проверьте, что фильтры по жанрам не дублируют произведения.'
+        )
+        assert response.json()['count'] == len(names)
+        return set(names)
+
+    def test_01_genre_any(self, client, titles):
+        assert self.names(client, {'genre__in': 'drama,comedy'}) == {
+            'Драма', 'Комедия', 'Трагикомедия', 'Всё сразу'
+        }, (
+            f'Проверьте, что `{self.TITLES_URL}?genre__in=` возвращает '
+            'произведения хотя бы с одним из жанров и сравнивает слаги '
+            'точно.'
+        )
+        assert self.names(client, {'genre__in': 'horror'}) == {'Всё сразу'}
+
+    def test_02_genre_all(self, client, titles):
+        assert self.names(client, {'genre_all': 'drama,comedy'}) == {
+            'Трагикомедия', 'Всё сразу'
+        }, (
+            f'Проверьте, что `{self.TITLES_URL}?genre_all=` возвращает '
+            'только произведения со всеми перечисленными жанрами.'
+        )
+        assert self.names(
+            client, {'genre_all': 'drama,comedy,drama,horror'}
+        ) == {'Всё сразу'}
+        assert self.names(client, {'genre_all': 'drama,unknown'}) == set()
+
+    def test_03_combined(self, client, titles):
+        assert self.names(
+            client, {'genre_all': 'comedy', 'genre__in': 'horror,dramedy'}
+        ) == {'Всё сразу'}
+        assert self.names(client, {'genre': 'dram'}) == {
+            'Драма', 'Трагикомедия', 'Всё сразу', 'Драмеди'
+        }
+
+    def test_04_genre_all_is_limited(self, client, titles):
+        response = client.get(self.TITLES_URL, {
+            'genre_all': ','.join(f'genre-{idx}' for idx in range(11))
+        })
+        assert response.status_code == 400
@@ -0,0 +1,88 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Genre, Review, Title
+from reviews.ranking import rebuild_rankings
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27TopTitles:
+
+    TOP_URL = '/api/v1/titles/top/'
+
+    @pytest.fixture
+    def titles(self, django_user_model):
+        authors = [
+            django_user_model.objects.create(
+                username=f'critic{idx}', email=f'critic{idx}@yamdb.fake'
+            )
+            for idx in range(20)
+        ]
+        films = Category.objects.create(name='Фильм', slug='films')
+        drama = Genre.objects.create(name='Драма', slug='drama')
+        catalog = {
+            'Одна десятка': (2001, films, [10]),
+            'Крепкий середняк': (2002, None, [9] * 20),
+            'Так себе': (2001, films, [6] * 5),
+            'Без отзывов': (2001, films, []),
+        }
+        titles = {}
+        for name, (year, category, scores) in catalog.items():
+            title = Title.objects.create(
+                name=name, year=year, category=category
+            )
+            title.genre.add(drama)
+            for author, score in zip(authors, scores):
+                Review.objects.create(
+                    title=title, author=author, text='Отзыв', score=score
+                )
+            titles[name] = title
+        rebuild_rankings()
+        return titles
+
+    def names(self, client, params=None):
+        response = client.get(self.TOP_URL, params or {})
+        assert response.status_code == 200
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_bayesian_order(self, client, titles):
+        assert self.names(client) == [
+            'Крепкий середняк', 'Одна десятка', 'Так себе'
+        ], (
+            f'Проверьте, что `{self.TOP_URL}` сортирует произведения по '
+            'сглаженному рейтингу и не включает произведения без отзывов.'
+        )
+
+    def test_02_filters(self, client, titles):
+        assert self.names(client, {'category': 'films'}) == [
+            'Одна десятка', 'Так себе'
+        ]
+        assert self.names(client, {'year': 2002}) == ['Крепкий середняк']
+        assert self.names(client, {'genre__in': 'drama'}) == [
+            'Крепкий середняк', 'Одна десятка', 'Так себе'
+        ]
+
+    def test_03_reviews_are_not_read(self, client, titles):
+        with CaptureQueriesContext(connection) as context:
+            self.names(client, {'genre': 'drama'})
+        assert not any(
+            'reviews_review' in query['sql']
+            for query in context.captured_queries
+        ), f'Проверьте, что `{self.TOP_URL}` не обращается к отзывам.'
+
+    def test_04_incremental_refresh(self, client, titles, django_user_model):
+        title = titles['Так себе']
+        for idx in range(30):
+            author = django_user_model.objects.create(
+                username=f'fan{idx}', email=f'fan{idx}@yamdb.fake'
+            )
+            Review.objects.create(
+                title=title, author=author, text='Отзыв', score=10
+            )
+        assert self.names(client)[0] == 'Так себе', (
+            'Проверьте, что рейтинг произведения обновляется при '
+            'добавлении отзыва.'
+        )
+        Review.objects.filter(title=title, score=10).delete()
+        assert self.names(client)[-1] == 'Так себе'
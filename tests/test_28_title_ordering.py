@@ -0,0 +1,77 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28TitleOrdering:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.fixture
+    def titles(self, django_user_model):
+        authors = [
+            django_user_model.objects.create(
+                username=f'critic{idx}', email=f'critic{idx}@yamdb.fake'
+            )
+            for idx in range(3)
+        ]
+        catalog = (
+            ('бета', 1990, [7, 9]),
+            ('Альфа', 2005, [10]),
+            ('гамма', 1980, [3, 4, 5]),
+            ('Дельта', 2005, []),
+        )
+        for name, year, scores in catalog:
+            title = Title.objects.create(name=name, year=year)
+            for author, score in zip(authors, scores):
+                Review.objects.create(
+                    title=title, author=author, text='Отзыв', score=score
+                )
+
+    def get(self, client, ordering):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(self.TITLES_URL, {'ordering': ordering})
+        return response, context.captured_queries
+
+    @pytest.mark.parametrize('ordering,expected', [
+        ('-rating', ['Альфа', 'бета', 'гамма', 'Дельта']),
+        ('year', ['гамма', 'бета', 'Альфа', 'Дельта']),
+        ('-year', ['Дельта', 'Альфа', 'бета', 'гамма']),
+        ('name', ['Альфа', 'бета', 'гамма', 'Дельта']),
+        ('-reviews_count', ['гамма', 'бета', 'Альфа', 'Дельта']),
+    ])
+    def test_01_ordering(self, client, titles, ordering, expected):
+        response, queries = self.get(client, ordering)
+        assert response.status_code == 200
+        assert [
+            title['name'] for title in response.json()['results']
+        ] == expected, (
+            f'Проверьте сортировку `{self.TITLES_URL}?ordering={ordering}`.'
+        )
+        title_queries = [
+            query for query in queries
+            if 'ORDER BY "reviews_title".' in query['sql']
+        ]
+        assert title_queries
+        with connection.cursor() as cursor:
+            for query in title_queries:
+                cursor.execute(
+                    f'EXPLAIN QUERY PLAN {query["sql"]}'.replace('%', '%%')
+                )
+                plan = ' '.join(row[-1] for row in cursor.fetchall())
+                assert 'TEMP B-TREE' not in plan, (
+                    f'Проверьте, что сортировка `{ordering}` читается из '
+                    f'индекса:\n{query["sql"]}\n{plan}'
+                )
+
+    @pytest.mark.parametrize(
+        'ordering', ['rating,-year', 'description', 'rating_sum']
+    )
+    def test_02_unsupported_ordering(self, client, titles, ordering):
+        response, _ = self.get(client, ordering)
+        assert response.status_code == 400, (
+            'Проверьте, что сортировка без индекса отклоняется.'
+        )
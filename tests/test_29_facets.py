@@ -0,0 +1,132 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Genre, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29Facets:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.fixture
+    def titles(self):
+        cache.clear()
+        films = Category.objects.create(name='Фильм', slug='films')
+        books = Category.objects.create(name='Книга', slug='books')
+        drama = Genre.objects.create(name='Драма', slug='drama')
+        comedy = Genre.objects.create(name='Комедия', slug='comedy')
+        catalog = (
+            ('Первый', 2001, films, [drama, comedy]),
+            ('Второй', 2001, films, [drama]),
+            ('Третий', 2002, books, [comedy]),
+            ('Четвёртый', 2003, None, []),
+        )
+        for name, year, category, genres in catalog:
+            title = Title.objects.create(
+                name=name, year=year, category=category
+            )
+            title.genre.set(genres)
+        yield
+        cache.clear()
+
+    def get(self, client, params):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(self.TITLES_URL, params)
+        assert response.status_code == 200
+        return response.json(), context.captured_queries
+
+    def test_01_facets(self, client, titles):
+        data, _ = self.get(client, {'facets': 'genre,category,year'})
+        assert data['count'] == 4
+        assert data['facets'] == {
+            'genre': [
+                {'slug': 'comedy', 'name': 'Комедия', 'count': 2},
+                {'slug': 'drama', 'name': 'Драма', 'count': 2},
+            ],
+            'category': [
+                {'slug': 'films', 'name': 'Фильм', 'count': 2},
+                {'slug': 'books', 'name': 'Книга', 'count': 1},
+            ],
+            'year': [
+                {'value': 2003, 'count': 1},
+                {'value': 2002, 'count': 1},
+                {'value': 2001, 'count': 2},
+            ],
+        }, (
+            f'Проверьте, что `{self.TITLES_URL}?facets=` возвращает число '
+            'произведений в каждой корзине.'
+        )
+
+    def test_02_facets_follow_filters(self, client, titles):
+        data, _ = self.get(
+            client, {'facets': 'category,unknown', 'genre__in': 'drama'}
+        )
+        assert data['facets'] == {
+            'category': [{'slug': 'films', 'name': 'Фильм', 'count': 2}]
+        }
+        data, _ = self.get(client, {})
+        assert 'facets' not in data
+
+    def test_03_constant_queries_and_cache(self, client, titles):
+        params = {'facets': 'genre,category,year', 'genre__in': 'drama,comedy'}
+        _, queries = self.get(client, params)
+        _, plain_queries = self.get(client, {'genre__in': 'drama,comedy'})
+        assert len(queries) - len(plain_queries) == 3, (
+            'Проверьте, что каждый фасет считается одним запросом.'
+        )
+        _, queries = self.get(client, {
+            'facets': 'genre,category,year', 'genre__in': 'comedy,drama,drama',
+            'ordering': '-year',
+        })
+        assert len(queries) == len(plain_queries), (
+            'Проверьте, что фасеты кешируются по нормализованным фильтрам.'
+        )
+
+    def test_04_cache_invalidation(self, client, titles):
+        params = {'facets': 'year'}
+        self.get(client, params)
+        title = Title.objects.create(name='Пятый', year=2003)
+        data, _ = self.get(client, params)
+        assert data['facets']['year'][0] == {'value': 2003, 'count': 2}, (
+            'Проверьте, что фасеты пересчитываются после изменения '
+            'произведений.'
+        )
+        title.genre.add(Genre.objects.get(slug='drama'))
+        data, _ = self.get(client, {'facets': 'genre'})
+        assert {'slug': 'drama', 'name': 'Драма', 'count': 3} in (
+            data['facets']['genre']
+        )
+
+    def test_05_facets_with_search(self, client, titles):
+        data, _ = self.get(
+            client, {'search': 'первый', 'facets': 'genre,category,year'}
+        )
+        assert [title['name'] for title in data['results']] == ['Первый']
+        assert data['facets'] == {
+            'genre': [
+                {'slug': 'comedy', 'name': 'Комедия', 'count': 1},
+                {'slug': 'drama', 'name': 'Драма', 'count': 1},
+            ],
+            'category': [{'slug': 'films', 'name': 'Фильм', 'count': 1}],
+            'year': [{'value': 2001, 'count': 1}],
+        }, (
+            f'Проверьте, что `{self.TITLES_URL}?search=&facets=` считает '
+            'фасеты по найденным произведениям.'
+        )
+        data, _ = self.get(client, {'search': '!!!', 'facets': 'year'})
+        assert data['facets'] == {'year': []}
+
+    def test_06_text_filters_keep_their_order(self, client, titles):
+        Title.objects.create(name='Альфа, Бета', year=2010)
+        Title.objects.create(name='Бета, Альфа', year=2011)
+        for name, year in (('альфа, бета', 2010), ('Бета,  Альфа', 2011)):
+            data, _ = self.get(client, {'name': name, 'facets': 'year'})
+            assert data['facets'] == {
+                'year': [{'value': year, 'count': 1}]
+            }, (
+                'Проверьте, что кеш фасетов различает текстовые фильтры с '
+                'разным порядком слов.'
+            )
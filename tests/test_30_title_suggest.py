@@ -0,0 +1,123 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.cache import bump_version
+from api.suggest import title_prefix_index
+from reviews.models import Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test30TitleSuggest:
+
+    SUGGEST_URL = '/api/v1/titles/suggest/'
+
+    @pytest.fixture
+    def titles(self):
+        cache.clear()
+        title_prefix_index.reset()
+        return {
+            name: Title.objects.create(name=name, year=2000)
+            for name in ('Ёлка', 'Елки-палки', 'Белка', 'Ель  Зелёная')
+        }
+
+    def names(self, client, query):
+        response = client.get(self.SUGGEST_URL, {'q': query})
+        assert response.status_code == 200
+        return [title['name'] for title in response.json()]
+
+    def test_01_prefix(self, client, titles):
+        assert self.names(client, 'ЕЛ') == [
+            'Ёлка', 'Елки-палки', 'Ель  Зелёная'
+        ], (
+            f'Проверьте, что `{self.SUGGEST_URL}?q=` подсказывает названия '
+            'по началу без учёта регистра и буквы ё.'
+        )
+        assert self.names(client, 'ель зел') == ['Ель  Зелёная']
+        assert self.names(client, 'белк')[0] == 'Белка'
+        assert self.names(client, 'лка') == []
+        assert self.names(client, ' ') == []
+
+    def test_02_no_queries_after_build(self, client, titles):
+        self.names(client, 'е')
+        with CaptureQueriesContext(connection) as context:
+            self.names(client, 'ел')
+        assert not context.captured_queries, (
+            f'Проверьте, что `{self.SUGGEST_URL}` отвечает из индекса в '
+            'памяти, не обращаясь к базе.'
+        )
+
+    def test_03_updates(self, client, titles):
+        self.names(client, 'е')
+        title = titles['Белка']
+        title.name = 'Ежевика'
+        title.save()
+        Title.objects.create(name='Еж', year=2001)
+        titles['Ёлка'].delete()
+        with CaptureQueriesContext(connection) as context:
+            names = self.names(client, 'е')
+        assert names == ['Еж', 'Ежевика', 'Елки-палки', 'Ель  Зелёная'], (
+            'Проверьте, что индекс обновляется при сохранении и удалении '
+            'произведений.'
+        )
+        assert not context.captured_queries
+
+    def test_04_limit_and_foreign_changes(self, client, titles, settings):
+        settings.TITLE_SUGGEST_LIMIT = 2
+        assert len(self.names(client, 'е')) == 2
+        Title.objects.filter(pk=titles['Белка'].pk).update(
+            name='Ежевика', name_normalized='ежевика'
+        )
+        bump_version(Title)
+        assert self.names(client, 'еж') == [], (
+            'Проверьте, что индекс перестраивается из-за чужих изменений не '
+            'чаще раза в TITLE_SUGGEST_CHECK_INTERVAL секунд.'
+        )
+        settings.TITLE_SUGGEST_CHECK_INTERVAL = 0
+        assert self.names(client, 'еж') == ['Ежевика'], (
+            'Проверьте, что индекс перестраивается, если каталог изменил '
+            'другой процесс.'
+        )
+
+    def test_05_bulk_changes_without_signals(self, client, titles,
+                                             settings):
+        assert self.names(client, 'ал') == []
+        Title.objects.bulk_create([Title(name='Альфа', year=2001)])
+        Title.objects.filter(name='Альфа').update(name_normalized='альфа')
+        Title.objects.filter(pk=titles['Белка'].pk).update(
+            name='Алмаз', name_normalized='алмаз'
+        )
+        assert self.names(client, 'ал') == [], (
+            'Проверьте, что индекс не сверяется с базой на каждый запрос.'
+        )
+        settings.TITLE_SUGGEST_CHECK_INTERVAL = 0
+        assert self.names(client, 'ал') == ['Алмаз', 'Альфа'], (
+            'Проверьте, что индекс замечает вставки в обход сигналов, '
+            'например из `load_data` в другом процессе.'
+        )
+
+    def test_06_cheap_freshness_check(self, client, titles, settings):
+        self.names(client, 'е')
+        settings.TITLE_SUGGEST_CHECK_INTERVAL = 0
+        with CaptureQueriesContext(connection) as context:
+            self.names(client, 'е')
+        assert len(context.captured_queries) == 1
+        sql = context.captured_queries[0]['sql'].upper()
+        assert 'COUNT' not in sql and 'LIMIT 1' in sql, (
+            'Проверьте, что свежесть индекса проверяется одним шагом по '
+            'первичному ключу, без обхода таблицы.'
+        )
+
+    def test_07_old_index_during_rebuild(self, client, titles, settings):
+        self.names(client, 'е')
+        Title.objects.bulk_create([
+            Title(name='Альфа', name_normalized='альфа', year=2001)
+        ])
+        settings.TITLE_SUGGEST_CHECK_INTERVAL = 0
+        with title_prefix_index.build_lock:
+            assert self.names(client, 'ал') == [], (
+                'Проверьте, что пока другой поток перестраивает индекс, '
+                'подсказки отдаются из прежнего, без ожидания.'
+            )
+        assert self.names(client, 'ал') == ['Альфа']
@@ -0,0 +1,54 @@
+import pytest
+
+from reviews.models import Title, TitleTrigram
+
+
+@pytest.mark.django_db(transaction=True)
+class Test31FuzzySearch:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.fixture
+    def titles(self):
+        return {
+            name: Title.objects.create(name=name, year=2000)
+            for name in (
+                'Война и мир', 'Щелкунчик', 'Harry Potter',
+                'Мастер и Маргарита',
+            )
+        }
+
+    def names(self, client, query):
+        response = client.get(self.TITLES_URL, {'fuzzy': query})
+        assert response.status_code == 200
+        return [title['name'] for title in response.json()['results']]
+
+    @pytest.mark.parametrize('query,expected', [
+        ('Воина и мир', 'Война и мир'),
+        ('Vojna i mir', 'Война и мир'),
+        ('щелкунчек', 'Щелкунчик'),
+        ('Schelkunchik', 'Щелкунчик'),
+        ('Гарри Поттер', 'Harry Potter'),
+        ('мастер маргарита', 'Мастер и Маргарита'),
+    ])
+    def test_01_typos_and_transliteration(self, client, titles, query,
+                                          expected):
+        assert self.names(client, query)[:1] == [expected], (
+            f'Проверьте, что `{self.TITLES_URL}?fuzzy={query}` находит '
+            'название с опечаткой или в транслитерации.'
+        )
+
+    def test_02_unrelated_query(self, client, titles):
+        assert self.names(client, 'Пиковая дама') == []
+        assert self.names(client, '!!!') == []
+
+    def test_03_index_is_maintained(self, client, titles):
+        title = titles['Щелкунчик']
+        title.name = 'Снегурочка'
+        title.save()
+        assert self.names(client, 'Снегурочко') == ['Снегурочка']
+        assert self.names(client, 'Щелкунчик') == []
+        title.delete()
+        assert not TitleTrigram.objects.filter(title_id=title.pk).exists(), (
+            'Проверьте, что триграммы удаляются вместе с произведением.'
+        )